@@ -0,0 +1,133 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# Internal pages every fake company site links to from its homepage
+SITE_PAGES = ("about", "team", "news", "products", "locations", "privacy")
+PARAGRAPH = "<p>We help customers in our industry work faster with reliable products and friendly service.</p>"
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connection bursts, adding ~1s SYN retransmits
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FakeServices:
+    """Local HTTP stand-in for SerpAPI and for company websites.
+    
+    ``/search`` answers SerpAPI-style queries and ``/site/<company>/...`` serves a small
+    multi-page company website. Every request can be delayed and can fail with a 503.
+    
+    Attributes:
+        latency: Seconds added to every response
+        error_rate: Probability (0-1) that a request fails with a 503
+        page_paragraphs: Number of filler paragraphs per page, to control page weight
+    """
+    
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, page_paragraphs: int = 200, seed: int = 0) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.page_paragraphs = page_paragraphs
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+    
+    def site_url(self, company: str) -> str:
+        """Return the homepage URL of a fake company."""
+        return f"{self.base_url}/site/{company}/"
+    
+    def __enter__(self) -> "FakeServices":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.error_rate
+    
+    def search(self, params: dict) -> dict:
+        """Build a SerpAPI-shaped response for a query."""
+        query = params.get("q", [""])[0]
+        name = query.split('"')[1] if '"' in query else query
+        slug = name.lower().replace(" ", "-")
+        results = [
+            {"title": f"{name} result {i}", "link": f"https://news.example.com/{slug}/{i}", "source": "Example News",
+             "date": f"{i + 1} days ago", "snippet": f"{name} announced update number {i} for its customers."}
+            for i in range(8)
+        ]
+        if params.get("engine", [""])[0] == "google_news":
+            return {"news_results": results}
+        return {
+            "organic_results": results,
+            "knowledge_graph": {"title": name, "type": "Company", "founded": "2001", "thumbnail": "https://img.example.com/x.png"},
+            "related_searches": [{"query": f"{name} alternative {i}", "link": "https://serpapi.com/search?q=x"} for i in range(8)],
+        }
+    
+    def page(self, company: str, page: str) -> str:
+        """Render one page of a fake company website."""
+        links = "".join(f"<a href='/site/{company}/{target}'>{target.title()}</a>" for target in SITE_PAGES)
+        return (
+            f"<html><head><title>{company.title()} - {page or 'Home'}</title>"
+            f"<meta name='description' content='{company.title()} official website'></head>"
+            f"<body><header><nav>{links}</nav></header><main><h1>{page or 'Welcome'}</h1>"
+            f"{PARAGRAPH * self.page_paragraphs}</main><footer>Copyright {company}</footer></body></html>"
+        )
+    
+    def _handler(self):
+        services = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment; otherwise delayed ACKs add ~40ms per response
+            disable_nagle_algorithm = True
+            wbufsize = 64 * 1024
+            
+            def log_message(self, *args):
+                pass
+            
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                if services.latency:
+                    time.sleep(services.latency)
+                if services._should_fail():
+                    self._send(503, b"Injected failure", "text/plain")
+                    return
+                
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split("/") if part]
+                if parts[:1] == ["search"]:
+                    body = json.dumps(services.search(parse_qs(parsed.query))).encode()
+                    self._send(200, body, "application/json")
+                elif parts[:1] == ["site"] and len(parts) >= 2:
+                    body = services.page(parts[1], "/".join(parts[2:])).encode()
+                    self._send(200, body, "text/html; charset=utf-8")
+                else:
+                    self._send(404, b"Not found", "text/plain")
+        
+        return Handler
\ No newline at end of file
@@ -0,0 +1,219 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+"""Offline end-to-end throughput benchmark for the research graph.
+
+Runs ``agentic_graph`` against the scripted fake chat model and a local stand-in for
+SerpAPI and company websites, once per concurrency level, each in a fresh process so
+that peak memory and import time are measured cleanly.
+
+Usage:
+    python -m benchmarks.run --companies 40 --concurrency 1,4,16
+    python -m benchmarks.run --baseline benchmarks/results/bench_20250611_120000.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+from src.telemetry import RunTracker
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Every fake site is served from 127.0.0.1, so per-host limits and provider quotas must not serialise the batch
+BENCH_ENV = {
+    "SERP_CACHE_ENABLED": "false",
+    "CRAWL_CACHE_ENABLED": "false",
+    "CHECKPOINT_ENABLED": "false",
+    # Every fake company site is served from the same host, so reuse would answer all but the first
+    "REPORT_FRESH_DAYS": "0",
+    "REPORT_REFRESH_DAYS": "0",
+    # The scripted report always passes the structural pre-screen, which would leave the
+    # reviewer and rewriter (and --rewrite-rate) unmeasured
+    "REVIEW_PRESCREEN_ENABLED": "false",
+    "HTTP_MAX_PER_HOST": "1000",
+    "CRAWL_PER_DOMAIN": "1000",
+    "CRAWL_DOMAIN_DELAY": "0",
+    "SERPAPI_RPM": "1000000",
+    "SERPAPI_MAX_CONCURRENCY": "1000",
+    "OPENAI_API_KEY": "benchmark",
+    "SERP_API_KEY": "benchmark",
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def summarize(durations: Dict[str, List[float]]) -> Dict[str, dict]:
+    """Reduce per-name duration samples to count, p50, p95 and max (seconds)."""
+    return {
+        name: {
+            "count": len(values),
+            "p50": round(percentile(values, 50), 4),
+            "p95": round(percentile(values, 95), 4),
+            "max": round(max(values), 4),
+        }
+        for name, values in sorted(durations.items())
+    }
+
+
+class TimingCollector(RunTracker):
+    """Callback handler that keeps every node and tool duration so percentiles can be computed."""
+    
+    def __init__(self, routers=()) -> None:
+        super().__init__(routers)
+        self.nodes: Dict[str, List[float]] = {}
+        self.tools: Dict[str, List[float]] = {}
+    
+    def record(self, kind, run, seconds, error, output):
+        if kind in ("node", "tool"):
+            target = self.nodes if kind == "node" else self.tools
+            target.setdefault(run.name, []).append(seconds)
+
+
+def run_level(args: argparse.Namespace, concurrency: int) -> dict:
+    """Benchmark one concurrency level in the current process."""
+    started = time.perf_counter()
+    from src.researcher import CompanyResearcher
+    import_seconds = time.perf_counter() - started
+    
+    from benchmarks.fake_server import FakeServices
+    from src.config import Config
+    from src.fake_llm import ScriptedChatModel
+    from src.graph import get_graph
+    from src.telemetry import graph_routers
+    
+    Config.LLM = ScriptedChatModel(latency=args.llm_latency, error_rate=args.llm_error_rate, rewrite_rate=args.rewrite_rate)
+    
+    with FakeServices(latency=args.http_latency, error_rate=args.http_error_rate, page_paragraphs=args.page_paragraphs) as services:
+        Config.SERP_API_URL = f"{services.base_url}/search"
+        companies = [(f"COMPANY{i}", services.site_url(f"company-{i}"), "Retail") for i in range(args.companies)]
+        graph = get_graph()
+        collector = TimingCollector(graph_routers(graph))
+        researcher = CompanyResearcher(graph=graph, callbacks=[collector])
+        
+        async def _batch():
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency * 4))
+            return await researcher.aresearch_companies(companies, concurrency=concurrency, timeout=args.timeout)
+        
+        summary = asyncio.run(_batch())
+        http_requests = services.requests
+    
+    elapsed = summary["elapsed_seconds"] or 1e-9
+    return {
+        "concurrency": concurrency,
+        "companies": summary["total"],
+        "succeeded": summary["succeeded"],
+        "failed": summary["failed"],
+        "timed_out": summary["timed_out"],
+        "elapsed_seconds": summary["elapsed_seconds"],
+        "companies_per_minute": round(summary["succeeded"] * 60 / elapsed, 2),
+        "import_seconds": round(import_seconds, 3),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "http_requests": http_requests,
+        "nodes": summarize(collector.nodes),
+        "tools": summarize(collector.tools),
+    }
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> List[str]:
+    """List the levels whose throughput or node p95 regressed by more than ``max_regression``."""
+    regressions = []
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in current["levels"]:
+        before = previous.get(level["concurrency"])
+        if not before:
+            continue
+        if level["companies_per_minute"] < before["companies_per_minute"] * (1 - max_regression):
+            regressions.append(f"c={level['concurrency']}: companies/min {before['companies_per_minute']} -> {level['companies_per_minute']}")
+        for node, stats in level["nodes"].items():
+            old = before["nodes"].get(node)
+            if old and old["p95"] and stats["p95"] > old["p95"] * (1 + max_regression):
+                regressions.append(f"c={level['concurrency']}: {node} p95 {old['p95']}s -> {stats['p95']}s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=20, help="Companies per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Probability that a fake LLM call fails")
+    parser.add_argument("--rewrite-rate", type=float, default=0.2, help="Probability that a review asks for a rewrite")
+    parser.add_argument("--http-latency", type=float, default=0.1, help="Seconds per fake HTTP response")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="Probability that a fake HTTP request returns 503")
+    parser.add_argument("--page-paragraphs", type=int, default=200, help="Filler paragraphs per fake web page")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-company timeout in seconds")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative slowdown before failing")
+    parser.add_argument("--level", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.level is not None:
+        # Child process: run one level and hand the result back on stdout
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                result = run_level(args, args.level)
+            finally:
+                sys.stdout = stdout
+        print(json.dumps(result))
+        return 0
+    
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, **BENCH_ENV, "PYTHONPATH": root}
+    passthrough = []
+    for option in ("companies", "llm_latency", "llm_error_rate", "rewrite_rate", "http_latency", "http_error_rate", "page_paragraphs", "timeout"):
+        passthrough += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    levels = []
+    for concurrency in [int(level) for level in args.concurrency.split(",")]:
+        # Each level runs in its own process and scratch directory (reports are written to the cwd)
+        with tempfile.TemporaryDirectory() as workdir:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.run", *passthrough, "--level", str(concurrency)],
+                cwd=workdir, env=env, capture_output=True, text=True, check=True,
+            )
+        level = json.loads(completed.stdout.strip().splitlines()[-1])
+        levels.append(level)
+        print(f"concurrency={concurrency:>3}  {level['companies_per_minute']:>8} companies/min  "
+              f"peak {level['peak_rss_mb']} MB  failed {level['failed'] + level['timed_out']}")
+    
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("level", "output", "baseline")},
+        "levels": levels,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -5,25 +5,165 @@
 # -----------------------------------------------------
 import json
 from datetime import datetime
-import requests
 
-from bs4 import BeautifulSoup
-
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
+from langchain_core.tools import StructuredTool, tool
 
 
 
 from src.config import Config
+from src.cache import ResponseCache, get_cache
+from src import http_client
+from src.crawler import acrawl_site, crawl_site
+from src.extract import format_page
+from src.parse_pool import aextract_response, extract_response
+from src.rate_limit import serpapi_limiter
+from src.singleflight import coalesce
+from src.telemetry import record_cache
 
-from langgraph.prebuilt import create_react_agent
 
+# The parameters that identify a SerpAPI query; the API key is deliberately excluded
+SERP_CACHE_KEY_FIELDS = ("engine", "q", "num", "hl")
 
 
+def _serp_cache():
+    """Return the shared SerpAPI response cache, or None when caching is disabled."""
+    if not Config.SERP_CACHE_ENABLED:
+        return None
+    return get_cache(Config.SERP_CACHE_PATH, Config.SERP_CACHE_MAX_MB * 1024 * 1024)
 
-# Convert your functions to tools using the @tool decorator
-@tool
-def scrape_company_website_tool(url: str) -> str:
+
+def _serpapi_search(params: dict, namespace: str, ttl: int) -> dict:
+    """Run a SerpAPI query, serving it from the on-disk response cache when possible.
+    
+    Args:
+        params: SerpAPI query parameters, excluding the API key
+        namespace: Cache namespace, normally the calling tool's name
+        ttl: How long (seconds) a successful response stays fresh
+        
+    Returns:
+        dict: The decoded SerpAPI response
+    """
+    cache = _serp_cache()
+    key = ResponseCache.make_key(params, SERP_CACHE_KEY_FIELDS)
+    
+    if cache is not None:
+        cached = cache.get(namespace, key)
+        record_cache(namespace, cached is not None)
+        if cached is not None:
+            print(f"SERPAPI CACHE HIT: {namespace}")
+            return cached
+    
+    response = http_client.get(Config.SERP_API_URL, params={**params, "api_key": Config.SERP_API_KEY}, limiter=serpapi_limiter())
+    data = response.json()
+    
+    # Never cache quota errors or failed searches
+    if cache is not None and response.is_success and "error" not in data:
+        cache.set(namespace, key, data, ttl)
+    return data
+
+
+async def _aserpapi_search(params: dict, namespace: str, ttl: int) -> dict:
+    """Async counterpart of ``_serpapi_search``."""
+    cache = _serp_cache()
+    key = ResponseCache.make_key(params, SERP_CACHE_KEY_FIELDS)
+    
+    if cache is not None:
+        cached = cache.get(namespace, key)
+        record_cache(namespace, cached is not None)
+        if cached is not None:
+            print(f"SERPAPI CACHE HIT: {namespace}")
+            return cached
+    
+    response = await http_client.aget(Config.SERP_API_URL, params={**params, "api_key": Config.SERP_API_KEY}, limiter=serpapi_limiter())
+    data = response.json()
+    
+    if cache is not None and response.is_success and "error" not in data:
+        cache.set(namespace, key, data, ttl)
+    return data
+
+
+def _news_params(company_name: str, industry: str) -> dict:
+    return {
+        "engine": "google_news",
+        "q": f'"{company_name}" ({industry}) company news',
+        "num": 8,
+        "hl": "en"
+    }
+
+
+def _format_news(data: dict) -> str:
+    news_results = []
+    if "news_results" in data:
+        for article in data["news_results"][:5]:
+            news_results.append({
+                "title": article.get("title", ""),
+                "link": article.get("link", ""),
+                "source": article.get("source", ""),
+                "date": article.get("date", ""),
+                "snippet": article.get("snippet", "")
+            })
+    
+    return json.dumps(news_results, indent=2)
+
+
+def _financial_params(company_name: str, industry: str) -> dict:
+    return {
+        "engine": "google",
+        "q": f'"{company_name} ({industry})" financial data revenue earnings stock price',
+        "num": 5,
+        "hl": "en"
+    }
+
+
+def _format_financial(data: dict) -> str:
+    financial_info = {
+        "search_results": [],
+        "knowledge_graph": data.get("knowledge_graph", {}),
+        "answer_box": data.get("answer_box", {})
+    }
+    
+    if "organic_results" in data:
+        for result in data["organic_results"][:3]:
+            financial_info["search_results"].append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", "")
+            })
+    
+    return json.dumps(financial_info, indent=2)
+
+
+def _competitors_params(company_name: str, industry: str) -> dict:
+    return {
+        "engine": "google",
+        "q": f'"{company_name} ({industry})" competitors alternatives similar companies industry',
+        "num": 5,
+        "hl": "en"
+    }
+
+
+def _format_competitors(data: dict) -> str:
+    competitor_info = {
+        "search_results": [],
+        "related_searches": data.get("related_searches", [])
+    }
+    
+    if "organic_results" in data:
+        for result in data["organic_results"][:3]:
+            competitor_info["search_results"].append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", "")
+            })
+    
+    return json.dumps(competitor_info, indent=2)
+
+
+# Each research tool has a blocking implementation and an async one; the tool object
+# picks the right one depending on whether it is invoked or awaited. Identical calls
+# that are in flight at the same time share one upstream request
+@coalesce
+def scrape_company_website(url: str) -> str:
     """Scrape the company's main website for basic information.
     
     Args:
@@ -34,35 +174,61 @@ def scrape_company_website_tool(url: str) -> str:
     """
     try:
         print(f"INVOKING SCRAPE TOOL ON: {url}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        with http_client.stream("GET", url) as response:
+            response.raise_for_status()
+            # Parse while downloading and stop as soon as enough text has been collected
+            page = extract_response(response, Config.SCRAPE_MAX_CHARS, Config.SCRAPE_MAX_BYTES)
+        return format_page(page)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract key information
-        title = soup.find('title').get_text() if soup.find('title') else ""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        meta_desc = meta_desc.get('content', '') if meta_desc else ""
+    except Exception as e:
+        return f"Error scraping website: {str(e)}"
+
+
+@coalesce
+async def ascrape_company_website(url: str) -> str:
+    """Async counterpart of ``scrape_company_website``."""
+    try:
+        print(f"INVOKING SCRAPE TOOL ON: {url}")
+        async with http_client.astream("GET", url) as response:
+            response.raise_for_status()
+            page = await aextract_response(response, Config.SCRAPE_MAX_CHARS, Config.SCRAPE_MAX_BYTES)
+        return format_page(page)
         
-        # Extract main content (remove scripts, styles, etc.)
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+    except Exception as e:
+        return f"Error scraping website: {str(e)}"
+
+
+@coalesce
+def crawl_company_website(url: str) -> str:
+    """Crawl the company's website: the homepage plus its about, team, news, product and location pages.
+    
+    Args:
+        url: The company website URL to crawl
         
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+    Returns:
+        Title, meta description and main content for each page fetched
+    """
+    try:
+        print(f"INVOKING CRAWL TOOL ON: {url}")
+        return crawl_site(url)
         
-        return f"Title: {title}\nMeta Description: {meta_desc}\nContent: {text[:3000]}..."
+    except Exception as e:
+        return f"Error crawling website: {str(e)}"
+
+
+@coalesce
+async def acrawl_company_website(url: str) -> str:
+    """Async counterpart of ``crawl_company_website``."""
+    try:
+        print(f"INVOKING CRAWL TOOL ON: {url}")
+        return await acrawl_site(url)
         
     except Exception as e:
-        return f"Error scraping website: {str(e)}"
+        return f"Error crawling website: {str(e)}"
 
-@tool
-def search_company_news_tool(company_name: str, industry:str) -> str:
+
+@coalesce
+def search_company_news(company_name: str, industry:str) -> str:
     """Search for recent news articles about the company.
     
     Args:
@@ -73,36 +239,27 @@ def search_company_news_tool(company_name: str, industry:str) -> str:
     """
     try:
         print(f"FETCHING NEWS ON: {company_name}")
-        url = "https://serpapi.com/search"
-        params = {
-            "engine": "google_news",
-            "q": f'"{company_name}" ({industry}) company news',
-            "api_key": Config.SERP_API_KEY,
-            "num": 8,
-            "hl": "en"
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        data = response.json()
-        
-        news_results = []
-        if "news_results" in data:
-            for article in data["news_results"][:5]:
-                news_results.append({
-                    "title": article.get("title", ""),
-                    "link": article.get("link", ""),
-                    "source": article.get("source", ""),
-                    "date": article.get("date", ""),
-                    "snippet": article.get("snippet", "")
-                })
-        
-        return json.dumps(news_results, indent=2)
+        data = _serpapi_search(_news_params(company_name, industry), "search_company_news_tool", Config.SERP_CACHE_TTL_NEWS)
+        return _format_news(data)
         
     except Exception as e:
         return f"Error searching news: {str(e)}"
 
-@tool
-def search_financial_data_tool(company_name: str, industry:str) -> str:
+
+@coalesce
+async def asearch_company_news(company_name: str, industry:str) -> str:
+    """Async counterpart of ``search_company_news``."""
+    try:
+        print(f"FETCHING NEWS ON: {company_name}")
+        data = await _aserpapi_search(_news_params(company_name, industry), "search_company_news_tool", Config.SERP_CACHE_TTL_NEWS)
+        return _format_news(data)
+        
+    except Exception as e:
+        return f"Error searching news: {str(e)}"
+
+
+@coalesce
+def search_financial_data(company_name: str, industry:str) -> str:
     """Search for financial information about the company.
     
     Args:
@@ -113,38 +270,111 @@ def search_financial_data_tool(company_name: str, industry:str) -> str:
     """
     try:
         print(f"FETCHING FINANCIAL DATA FOR: {company_name}")
-        url = "https://serpapi.com/search"
-        params = {
-            "engine": "google",
-            "q": f'"{company_name} ({industry})" financial data revenue earnings stock price',
-            "api_key": Config.SERP_API_KEY,
-            "num": 5,
-            "hl": "en"
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        data = response.json()
-        
-        financial_info = {
-            "search_results": [],
-            "knowledge_graph": data.get("knowledge_graph", {}),
-            "answer_box": data.get("answer_box", {})
-        }
-        
-        if "organic_results" in data:
-            for result in data["organic_results"][:3]:
-                financial_info["search_results"].append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", "")
-                })
-        
-        return json.dumps(financial_info, indent=2)
+        data = _serpapi_search(_financial_params(company_name, industry), "search_financial_data_tool", Config.SERP_CACHE_TTL_FINANCIAL)
+        return _format_financial(data)
         
     except Exception as e:
         return f"Error searching financial data: {str(e)}"
+
+
+@coalesce
+async def asearch_financial_data(company_name: str, industry:str) -> str:
+    """Async counterpart of ``search_financial_data``."""
+    try:
+        print(f"FETCHING FINANCIAL DATA FOR: {company_name}")
+        data = await _aserpapi_search(_financial_params(company_name, industry), "search_financial_data_tool", Config.SERP_CACHE_TTL_FINANCIAL)
+        return _format_financial(data)
+        
+    except Exception as e:
+        return f"Error searching financial data: {str(e)}"
+
+
+@coalesce
+def search_competitors(company_name: str, industry:str) -> str:
+    """Search for competitor information.
+    
+    Args:
+        company_name: Name of the company to search competitors for
+        
+    Returns:
+        JSON string of competitor information
+    """
+    try:
+        print(f"FETCHING COMPETITORS OF: {company_name}")
+        data = _serpapi_search(_competitors_params(company_name, industry), "search_competitors_tool", Config.SERP_CACHE_TTL_COMPETITORS)
+        return _format_competitors(data)
+        
+    except Exception as e:
+        return f"Error searching competitors: {str(e)}"
+
+
+@coalesce
+async def asearch_competitors(company_name: str, industry:str) -> str:
+    """Async counterpart of ``search_competitors``."""
+    try:
+        print(f"FETCHING COMPETITORS OF: {company_name}")
+        data = await _aserpapi_search(_competitors_params(company_name, industry), "search_competitors_tool", Config.SERP_CACHE_TTL_COMPETITORS)
+        return _format_competitors(data)
+        
+    except Exception as e:
+        return f"Error searching competitors: {str(e)}"
+
+
+scrape_company_website_tool = StructuredTool.from_function(
+    func=scrape_company_website, coroutine=ascrape_company_website, name="scrape_company_website_tool"
+)
+crawl_company_website_tool = StructuredTool.from_function(
+    func=crawl_company_website, coroutine=acrawl_company_website, name="crawl_company_website_tool"
+)
+search_company_news_tool = StructuredTool.from_function(
+    func=search_company_news, coroutine=asearch_company_news, name="search_company_news_tool"
+)
+search_financial_data_tool = StructuredTool.from_function(
+    func=search_financial_data, coroutine=asearch_financial_data, name="search_financial_data_tool"
+)
+search_competitors_tool = StructuredTool.from_function(
+    func=search_competitors, coroutine=asearch_competitors, name="search_competitors_tool"
+)
+    
     
+def report_filename(company_name: str) -> str:
+    """Build the timestamped markdown filename a company's report is saved under.
+    
+    Args:
+        company_name: The name of the company being researched
+        
+    Returns:
+        str: The filename, relative to the working directory
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"company_report_{safe_company_name(company_name)}_{timestamp}.md"
+
+
+def safe_company_name(company_name: str) -> str:
+    """Reduce a company name to the form used in report filenames.
     
+    Args:
+        company_name: The name of the company being researched
+        
+    Returns:
+        str: The name with only letters, digits, underscores and hyphens
+    """
+    if not company_name or not company_name.strip():
+        company_name = "unknown_company"
+    safe_name = company_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+    # Remove any other problematic characters
+    return ''.join(c for c in safe_name if c.isalnum() or c in '_-')
+
+
+def report_header(company_name: str) -> str:
+    """Return the title block written at the top of every saved report."""
+    return (
+        f"# Company Research Report: {company_name}\n"
+        f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        "\n" + "=" * 80 + "\n\n"
+    )
+
+
 @tool
 def save_report_tool(report_content: str, company_name:str) -> str:
     """
@@ -166,18 +396,11 @@ def save_report_tool(report_content: str, company_name:str) -> str:
             company_name = "unknown_company"
             
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_company_name = company_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-        # Remove any other problematic characters
-        safe_company_name = ''.join(c for c in safe_company_name if c.isalnum() or c in '_-')
-        filename = f"company_report_{safe_company_name}_{timestamp}.md"
+        filename = report_filename(company_name)
         
-                
         # Write the report to file
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Company Research Report: {company_name}\n")
-            f.write(f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
-            f.write("\n" + "=" * 80 + "\n\n")
+            f.write(report_header(company_name))
             f.write(report_content)
         
         success_msg = f"Report successfully saved to: {filename}"
@@ -189,58 +412,22 @@ def save_report_tool(report_content: str, company_name:str) -> str:
         print(error_msg)
         return error_msg
 
-@tool
-def search_competitors_tool(company_name: str, industry:str) -> str:
-    """Search for competitor information.
+
+def create_company_research_agent(llm=None):
+    """Create a ReAct agent with company research tools.
     
     Args:
-        company_name: Name of the company to search competitors for
-        
-    Returns:
-        JSON string of competitor information
+        llm: The chat model driving the agent (defaults to the research agent's configured model)
     """
-    try:
-        print(f"FETCHING COMPETITORS OF: {company_name}")
-        url = "https://serpapi.com/search"
-        params = {
-            "engine": "google",
-            "q": f'"{company_name} ({industry})" competitors alternatives similar companies industry',
-            "api_key": Config.SERP_API_KEY,
-            "num": 5,
-            "hl": "en"
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        data = response.json()
-        
-        competitor_info = {
-            "search_results": [],
-            "related_searches": data.get("related_searches", [])
-        }
-        
-        if "organic_results" in data:
-            for result in data["organic_results"][:3]:
-                competitor_info["search_results"].append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", "")
-                })
-        
-        return json.dumps(competitor_info, indent=2)
-        
-    except Exception as e:
-        return f"Error searching competitors: {str(e)}"
-    
-
-def create_company_research_agent():
-    """Create a ReAct agent with company research tools."""
+    from langgraph.prebuilt import create_react_agent
     
     # Initialize LLM
-    llm = Config.LLM
+    llm = llm or Config.model_for("research_agent")
     
     # Define the tools list
     tools = [
         scrape_company_website_tool,
+        crawl_company_website_tool,
         search_company_news_tool,
         search_financial_data_tool,
         search_competitors_tool,
@@ -249,4 +436,20 @@ def create_company_research_agent():
     # Create the agent
     agent = create_react_agent(llm, tools)
     
-    return agent
\ No newline at end of file
+    return agent
+
+
+_agent_cache = {}
+
+
+def get_company_research_agent():
+    """Return the ReAct research agent, compiling it only once per chat model.
+    
+    Returns:
+        CompiledStateGraph: The cached agent for the research agent's current model
+    """
+    llm = Config.model_for("research_agent")
+    # Keyed on the model instance so that swapping Config.LLM (e.g. in a benchmark) takes effect
+    if _agent_cache.get("llm") is not llm:
+        _agent_cache.update(llm=llm, agent=create_company_research_agent(llm))
+    return _agent_cache["agent"]
\ No newline at end of file
@@ -0,0 +1,171 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+import zstandard
+
+
+class ResponseCache:
+    """A persistent key/value cache stored in a local SQLite file.
+    
+    Values are JSON-serialised and zstd-compressed. Every entry carries its own TTL,
+    and once the stored payload grows past ``max_bytes`` the expired entries are dropped
+    first, followed by the least recently used ones.
+    
+    Attributes:
+        path: Location of the SQLite database file
+        max_bytes: Upper bound on the total compressed payload size
+    """
+    
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Open (or create) the cache database.
+        
+        Args:
+            path: Location of the SQLite database file
+            max_bytes: Upper bound on the total compressed payload size
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> str:
+        """Build a stable cache key from request parameters.
+        
+        String values are lower-cased and whitespace-collapsed so that trivially different
+        spellings of the same query share one entry.
+        
+        Args:
+            params: The request parameters
+            fields: Optional subset of parameter names that identify the request
+            
+        Returns:
+            str: A hex digest identifying the request
+        """
+        names = sorted(fields) if fields is not None else sorted(params)
+        normalized = {}
+        for name in names:
+            value = params.get(name)
+            if isinstance(value, str):
+                value = " ".join(value.lower().split())
+            normalized[name] = value
+        payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return a cached value, or None if it is missing or expired.
+        
+        Args:
+            namespace: Logical group of the entry (for example the tool name)
+            key: The entry key, usually produced by ``make_key``
+            
+        Returns:
+            Optional[Any]: The cached value
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None or row[1] < now:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+            )
+        return json.loads(self._decompressor.decompress(row[0]))
+    
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting old entries if the cache is full.
+        
+        Args:
+            namespace: Logical group of the entry (for example the tool name)
+            key: The entry key, usually produced by ``make_key``
+            value: Any JSON-serialisable value
+            ttl: Time to live in seconds
+        """
+        blob = self._compressor.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, blob, len(blob), now + ttl, now),
+            )
+            self._size += len(blob) - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict(now)
+    
+    def clear(self, namespace: str) -> None:
+        """Drop every entry of a namespace.
+        
+        Args:
+            namespace: Logical group of the entries (for example the tool name)
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones, until the cache is at 90% of its bound."""
+        self._conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        target = int(self.max_bytes * 0.9)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self._size > target:
+            rows = self._conn.execute("SELECT namespace, key, size FROM entries ORDER BY accessed_at")
+            victims = []
+            for namespace, key, size in rows:
+                if self._size <= target:
+                    break
+                victims.append((namespace, key))
+                self._size -= size
+            self._conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+
+
+@lru_cache(maxsize=None)
+def get_cache(path: str, max_bytes: int) -> ResponseCache:
+    """Return the process-wide ResponseCache for ``path``, opening it on first use.
+    
+    Args:
+        path: Location of the SQLite database file
+        max_bytes: Upper bound on the total compressed payload size
+        
+    Returns:
+        ResponseCache: The shared cache instance
+    """
+    return ResponseCache(path, max_bytes)
\ No newline at end of file
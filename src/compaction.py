@@ -0,0 +1,195 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import json
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.config import Config
+
+if TYPE_CHECKING:
+    import tiktoken
+
+
+# Rough characters-per-token ratio, used only when no tiktoken encoding can be loaded
+CHARS_PER_TOKEN = 4
+# Knowledge graph / answer box keys that carry images, tracking links or UI furniture
+NOISE_KEY_PATTERN = re.compile(r"(link|thumbnail|image|icon|serpapi|kgmid|token|position|header_images)", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Optional["tiktoken.Encoding"]:
+    """Return the tiktoken encoding for the configured model, or None if none can be loaded.
+    
+    Returns:
+        Optional[tiktoken.Encoding]: The encoding, falling back to o200k_base for unknown models
+    """
+    # Imported on first use, like the other heavy dependencies, to keep imports fast
+    import tiktoken
+    
+    try:
+        return tiktoken.encoding_for_model(Config.MODEL_NAME or "")
+    except KeyError:
+        pass
+    except Exception:
+        # The BPE file could not be loaded (e.g. no network on first use)
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens ``text`` will use in a prompt.
+    
+    Args:
+        text: The text to measure
+        
+    Returns:
+        int: Token count (estimated from length if tiktoken is unavailable)
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut ``text`` down to ``budget`` tokens, preferring to end on a sentence boundary.
+    
+    Args:
+        text: The text to shorten
+        budget: Maximum number of tokens to keep
+        
+    Returns:
+        str: The shortened text
+    """
+    if count_tokens(text) <= budget:
+        return text
+    encoding = get_encoding()
+    if encoding is None:
+        cut = text[:budget * CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    boundary = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "), cut.rfind("\n"))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + " ..."
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _first_seen(key: str, seen: set) -> bool:
+    """Record ``key`` and report whether it is new. Empty keys never count as duplicates."""
+    if not key:
+        return True
+    if key in seen:
+        return False
+    seen.add(key)
+    return True
+
+
+def _flatten(value: dict) -> List[str]:
+    """Keep only the scalar, non-noise fields of a knowledge graph or answer box as 'key: value' lines."""
+    lines = []
+    for key, item in value.items():
+        if NOISE_KEY_PATTERN.search(key) or isinstance(item, (dict, list)) or item in (None, ""):
+            continue
+        lines.append(f"{key.replace('_', ' ')}: {item}")
+    return lines
+
+
+def _result_line(result: dict) -> str:
+    """Render one search/news result as a single markdown line."""
+    title = result.get("title", "").strip()
+    link = result.get("link", "").strip()
+    meta = ", ".join(part for part in (result.get("source", ""), result.get("date", "")) if part)
+    line = f"- [{title}]({link})" if link else f"- {title}"
+    if meta:
+        line += f" ({meta})"
+    if result.get("snippet"):
+        line += f": {result['snippet'].strip()}"
+    return line
+
+
+def _compact_lines(raw: str, seen: set) -> List[str]:
+    """Turn one raw tool output into compact, de-duplicated lines."""
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        data = None
+    
+    if isinstance(data, dict):
+        # Financial / competitor output: drop related searches, flatten the blobs
+        results = data.get("search_results", [])
+        facts = _flatten(data.get("knowledge_graph") or {}) + _flatten(data.get("answer_box") or {})
+    elif isinstance(data, list):
+        # News output
+        results, facts = data, []
+    else:
+        # Website text or an error message: de-duplicate sentences
+        results = []
+        facts = SENTENCE_SPLIT.split(" ".join(str(raw).split()))
+    
+    if isinstance(data, (dict, list)):
+        lines = [fact for fact in facts if _first_seen(_normalize(fact), seen)]
+    else:
+        lines = [" ".join(sentence for sentence in facts if _first_seen(_normalize(sentence), seen))]
+    
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        link = result.get("link", "")
+        snippet = _normalize(result.get("snippet", "") or result.get("title", ""))
+        # Evaluate both so that the link and the snippet are each remembered
+        new_link, new_snippet = _first_seen(link, seen), _first_seen(snippet, seen)
+        if new_link and new_snippet:
+            lines.append(_result_line(result))
+    return lines
+
+
+def compact_evidence(evidence: Dict[str, str], budget: int) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Shrink raw tool outputs so that together they fit in ``budget`` tokens.
+    
+    Useless fields (related searches, images, tracking links) are dropped, repeated
+    snippets and links are removed across all sources, and each source is then fitted
+    into an equal share of the budget.
+    
+    Args:
+        evidence: Mapping of evidence source to raw tool output
+        budget: Total token budget for all sources
+        
+    Returns:
+        Tuple[Dict[str, str], Dict[str, int]]: The compacted evidence, and token counts
+            under the keys 'tokens_before', 'tokens_after' and 'tokens_saved'
+    """
+    if not evidence:
+        return {}, {"tokens_before": 0, "tokens_after": 0, "tokens_saved": 0}
+    
+    per_source = max(budget // len(evidence), 1)
+    seen = set()
+    compacted = {}
+    before = after = 0
+    for source, raw in evidence.items():
+        raw = raw or ""
+        before += count_tokens(raw)
+        lines, kept = _compact_lines(raw, seen), []
+        # Drop whole results from the end before cutting text mid-way
+        used = 0
+        for line in lines:
+            cost = count_tokens(line) + 1
+            if used + cost > per_source and kept:
+                break
+            kept.append(line)
+            used += cost
+        compacted[source] = truncate_to_tokens("\n".join(kept), per_source)
+        after += count_tokens(compacted[source])
+    
+    return compacted, {"tokens_before": before, "tokens_after": after, "tokens_saved": before - after}
\ No newline at end of file
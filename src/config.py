@@ -4,14 +4,199 @@
 # Project: ThinkBridge Assignment
 # -----------------------------------------------------
 import os
-from langchain_openai import ChatOpenAI
+import threading
 
-class Config:
+
+def _default_batch_id(path: str) -> str:
+    """Name a batch after its input file and that file's modification time, so editing the list starts a new batch."""
+    try:
+        return f"{os.path.basename(path)}@{int(os.path.getmtime(path))}"
+    except OSError:
+        return "default"
+
+
+class _LazyConfig(type):
+    """Metaclass that builds expensive Config attributes on first access instead of at import."""
+    
+    _models = {}
+    _llm_override = None
+    _llm_lock = threading.Lock()
+    
+    @property
+    def LLM(cls):
+        """The report writer's chat model. Setting it makes every graph node use the given model."""
+        return cls.model_for("researcher")
+    
+    @LLM.setter
+    def LLM(cls, llm):
+        cls._llm_override = llm
+    
+    def model_for(cls, node: str):
+        """Return the chat model configured for a graph node in NODE_MODELS, created on first use.
+        
+        Nodes configured with the same model name share one instance.
+        
+        Args:
+            node: The graph node (or "research_agent") the model is for
+            
+        Returns:
+            BaseChatModel: The chat model
+        """
+        if cls._llm_override is not None:
+            return cls._llm_override
+        model_name = cls.NODE_MODELS.get(node) or cls.MODEL_NAME
+        if model_name not in cls._models:
+            with cls._llm_lock:
+                if model_name not in cls._models:
+                    cls._models[model_name] = cls._create_model(model_name)
+        return cls._models[model_name]
+    
+    def _create_model(cls, model_name: str):
+        if model_name == "fake":
+            # Offline scripted model for tests and local runs without an API key
+            from src.fake_llm import ScriptedChatModel
+            from src.llm_cache import get_llm_cache
+            return ScriptedChatModel(model_name="fake", cache=get_llm_cache())
+        
+        # Importing langchain_openai (and openai) alone takes about a second
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(
+            model=model_name,
+            api_key=cls.OPENAI_API_KEY,
+            temperature=0.3,
+            # Report token usage on streamed responses too (for telemetry)
+            stream_usage=True,
+            # The rate limiter retries 429s itself so it can adapt to them
+            max_retries=0 if cls.RATE_LIMIT_ENABLED else 2
+        )
+        if cls.RATE_LIMIT_ENABLED:
+            from src.rate_limit import RateLimitedChatModel
+            llm = RateLimitedChatModel(inner=llm, provider="openai")
+        # Attached to the outermost model so that cache hits skip the rate limiter too
+        from src.llm_cache import get_llm_cache
+        llm.cache = get_llm_cache()
+        return llm
+
+
+class Config(metaclass=_LazyConfig):
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
     SERP_API_KEY = os.environ.get("SERP_API_KEY")
+    SERP_API_URL = os.environ.get("SERP_API_URL", "https://serpapi.com/search")
     MODEL_NAME = os.environ.get("MODEL_NAME")
-    LLM = ChatOpenAI(
-        model=MODEL_NAME,
-        api_key=OPENAI_API_KEY,
-        temperature=0.3
-    )
\ No newline at end of file
+    # Chat model per graph node: the fast tier drives the gap-filling tool calls and grades
+    # reports, the writer tier writes them. Both default to MODEL_NAME; "fake" selects the
+    # offline scripted model
+    FAST_MODEL_NAME = os.environ.get("FAST_MODEL_NAME") or MODEL_NAME
+    WRITER_MODEL_NAME = os.environ.get("WRITER_MODEL_NAME") or MODEL_NAME
+    NODE_MODELS = {
+        "research_agent": os.environ.get("RESEARCH_AGENT_MODEL_NAME") or FAST_MODEL_NAME,
+        "researcher": os.environ.get("RESEARCHER_MODEL_NAME") or WRITER_MODEL_NAME,
+        "rewriter": os.environ.get("REWRITER_MODEL_NAME") or WRITER_MODEL_NAME,
+        "reviewer": os.environ.get("REVIEWER_MODEL_NAME") or FAST_MODEL_NAME,
+        "refresh_news": os.environ.get("REFRESH_NEWS_MODEL_NAME") or FAST_MODEL_NAME,
+    }
+    # Batch mode: how many companies are in flight at once and how long (seconds)
+    # a single company may run before it is abandoned (0 disables the timeout)
+    BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+    COMPANY_TIMEOUT = float(os.environ.get("COMPANY_TIMEOUT", "900"))
+    # Stream each report into a .partial.md file (and the console, when one company runs at a
+    # time) while it is written; the file becomes the final report once the reviewer accepts it
+    STREAM_REPORTS = os.environ.get("STREAM_REPORTS", "false").lower() == "true"
+    # Input ingestion: the company list (CSV or JSONL) is read lazily in chunks, repeated domains are
+    # dropped and companies with a stored report younger than REPORT_FRESH_DAYS are skipped (0 never skips).
+    # COMPANY_COUNT caps how many companies are researched (0 researches them all)
+    COMPANIES_PATH = os.environ.get("COMPANIES_PATH", "companies.csv")
+    COMPANY_COUNT = int(os.environ.get("COMPANY_COUNT", "1"))
+    INGEST_CHUNK_SIZE = int(os.environ.get("INGEST_CHUNK_SIZE", "10000"))
+    INGEST_QUEUE_SIZE = int(os.environ.get("INGEST_QUEUE_SIZE", str(BATCH_CONCURRENCY * 4)))
+    REPORT_FRESH_DAYS = float(os.environ.get("REPORT_FRESH_DAYS", "7"))
+    # A company researched again with a stored report younger than REPORT_FRESH_DAYS gets that
+    # report back; one researched less than REPORT_REFRESH_DAYS ago only has its news section updated
+    # (0 disables). News-only refreshes do not reset the research date
+    REPORT_REFRESH_DAYS = float(os.environ.get("REPORT_REFRESH_DAYS", "30"))
+    # Accepted reports are kept zstd-compressed in an indexed SQLite store; REPORT_FILES_ENABLED
+    # also saves each one as a company_report_<NAME>_<timestamp>.md file
+    REPORT_STORE_PATH = os.environ.get("REPORT_STORE_PATH", os.path.join(".cache", "reports.sqlite3"))
+    REPORT_FILES_ENABLED = os.environ.get("REPORT_FILES_ENABLED", "true").lower() == "true"
+    # Batch checkpoints: interrupted companies resume from their last completed node, and ones that
+    # finished less than REPORT_FRESH_DAYS ago are skipped. BATCH_ID defaults to the input file's
+    # name and modification time; change it to start a fresh run over the same companies
+    CHECKPOINT_ENABLED = os.environ.get("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_PATH = os.environ.get("CHECKPOINT_PATH", os.path.join(".cache", "checkpoints.sqlite3"))
+    BATCH_ID = os.environ.get("BATCH_ID") or _default_batch_id(COMPANIES_PATH)
+    # On-disk SerpAPI response cache, with a TTL (seconds) per search tool
+    SERP_CACHE_ENABLED = os.environ.get("SERP_CACHE_ENABLED", "true").lower() == "true"
+    SERP_CACHE_PATH = os.environ.get("SERP_CACHE_PATH", os.path.join(".cache", "serpapi.sqlite3"))
+    SERP_CACHE_MAX_MB = int(os.environ.get("SERP_CACHE_MAX_MB", "256"))
+    SERP_CACHE_TTL_NEWS = int(os.environ.get("SERP_CACHE_TTL_NEWS", str(6 * 3600)))
+    SERP_CACHE_TTL_FINANCIAL = int(os.environ.get("SERP_CACHE_TTL_FINANCIAL", str(7 * 24 * 3600)))
+    SERP_CACHE_TTL_COMPETITORS = int(os.environ.get("SERP_CACHE_TTL_COMPETITORS", str(30 * 24 * 3600)))
+    # Shared HTTP client: pool size, per-host concurrency and retry/backoff policy
+    HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "15"))
+    HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", "8"))
+    HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_MAX_BACKOFF = float(os.environ.get("HTTP_MAX_BACKOFF", "30"))
+    # Process-wide provider quotas: requests/tokens per minute and the most calls in flight.
+    # Concurrency is halved on every 429 or 5xx and recovers as calls succeed
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    OPENAI_RPM = int(os.environ.get("OPENAI_RPM", "500"))
+    OPENAI_TPM = int(os.environ.get("OPENAI_TPM", "450000"))
+    OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16"))
+    SERPAPI_RPM = int(os.environ.get("SERPAPI_RPM", "100"))
+    SERPAPI_MAX_CONCURRENCY = int(os.environ.get("SERPAPI_MAX_CONCURRENCY", "8"))
+    # Completion tokens reserved against OPENAI_TPM per call until the real usage is known
+    LLM_COMPLETION_TOKENS = int(os.environ.get("LLM_COMPLETION_TOKENS", "1500"))
+    # Opt-in on-disk cache of chat model responses, keyed by model, parameters, tools and prompt.
+    # Meant for replaying batches and iterating on prompts: an unchanged call is answered from disk
+    LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "false").lower() == "true"
+    LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(".cache", "llm.sqlite3"))
+    LLM_CACHE_MAX_MB = int(os.environ.get("LLM_CACHE_MAX_MB", "512"))
+    LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    # Prompt token budget for the gathered evidence, shared equally across sources, per graph node
+    EVIDENCE_TOKEN_BUDGET = int(os.environ.get("EVIDENCE_TOKEN_BUDGET", "6000"))
+    EVIDENCE_TOKEN_BUDGETS = {
+        "researcher": int(os.environ.get("RESEARCHER_EVIDENCE_TOKENS", str(EVIDENCE_TOKEN_BUDGET))),
+        "rewriter": int(os.environ.get("REWRITER_EVIDENCE_TOKENS", "4000")),
+    }
+    # Characters of page text the scraper keeps before compaction, and the most bytes it downloads per page
+    SCRAPE_MAX_CHARS = int(os.environ.get("SCRAPE_MAX_CHARS", "8000"))
+    SCRAPE_MAX_BYTES = int(os.environ.get("SCRAPE_MAX_BYTES", str(1024 * 1024)))
+    # Optional process pool that parses downloaded pages on other cores (0 parses inline while
+    # streaming). Workers are replaced after PARSE_MAX_TASKS_PER_CHILD pages, and at most
+    # PARSE_QUEUE_SIZE pages are handed to the pool at once (default four per worker)
+    PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0"))
+    PARSE_MAX_TASKS_PER_CHILD = int(os.environ.get("PARSE_MAX_TASKS_PER_CHILD", "500"))
+    PARSE_QUEUE_SIZE = int(os.environ.get("PARSE_QUEUE_SIZE", "0"))
+    # Structural pre-screen before the LLM review: reports that clearly pass or clearly fail
+    # these checks are graded locally and only borderline ones are sent to the model
+    REVIEW_PRESCREEN_ENABLED = os.environ.get("REVIEW_PRESCREEN_ENABLED", "true").lower() == "true"
+    REVIEW_PASS_MIN_WORDS = int(os.environ.get("REVIEW_PASS_MIN_WORDS", "800"))
+    REVIEW_PASS_MIN_LINKS = int(os.environ.get("REVIEW_PASS_MIN_LINKS", "5"))
+    REVIEW_FAIL_BELOW_WORDS = int(os.environ.get("REVIEW_FAIL_BELOW_WORDS", "300"))
+    REVIEW_FAIL_MISSING_SECTIONS = int(os.environ.get("REVIEW_FAIL_MISSING_SECTIONS", "3"))
+    # Multi-page site crawler: pages per company (1 disables crawling), per-domain politeness
+    # and the conditional-GET page cache
+    CRAWL_MAX_PAGES = int(os.environ.get("CRAWL_MAX_PAGES", "5"))
+    CRAWL_PER_DOMAIN = int(os.environ.get("CRAWL_PER_DOMAIN", "2"))
+    CRAWL_DOMAIN_DELAY = float(os.environ.get("CRAWL_DOMAIN_DELAY", "0.5"))
+    CRAWL_PAGE_MAX_CHARS = int(os.environ.get("CRAWL_PAGE_MAX_CHARS", "3000"))
+    CRAWL_CACHE_ENABLED = os.environ.get("CRAWL_CACHE_ENABLED", "true").lower() == "true"
+    CRAWL_CACHE_PATH = os.environ.get("CRAWL_CACHE_PATH", os.path.join(".cache", "pages.sqlite3"))
+    CRAWL_CACHE_MAX_MB = int(os.environ.get("CRAWL_CACHE_MAX_MB", "256"))
+    CRAWL_CACHE_TTL = int(os.environ.get("CRAWL_CACHE_TTL", str(30 * 24 * 3600)))
+    # Telemetry: per-node/tool timing, token and cache events appended as JSONL, and an
+    # optional Prometheus-style /metrics endpoint
+    TELEMETRY_ENABLED = os.environ.get("TELEMETRY_ENABLED", "true").lower() == "true"
+    TELEMETRY_PATH = os.environ.get("TELEMETRY_PATH", os.path.join(".cache", "telemetry.jsonl"))
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_HOST = os.environ.get("METRICS_HOST", "0.0.0.0")
+    METRICS_PORT = int(os.environ.get("METRICS_PORT", "8000"))
+    # Job service (python -m src.service): listen address, worker pool size, queue bound
+    # and how many finished jobs are kept for status queries
+    SERVICE_HOST = os.environ.get("SERVICE_HOST", "0.0.0.0")
+    SERVICE_PORT = int(os.environ.get("SERVICE_PORT", "8000"))
+    SERVICE_WORKERS = int(os.environ.get("SERVICE_WORKERS", str(BATCH_CONCURRENCY)))
+    SERVICE_QUEUE_SIZE = int(os.environ.get("SERVICE_QUEUE_SIZE", "1000"))
+    SERVICE_JOB_HISTORY = int(os.environ.get("SERVICE_JOB_HISTORY", "1000"))
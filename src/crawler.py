@@ -0,0 +1,239 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from src import http_client
+from src.cache import get_cache
+from src.config import Config
+from src.parse_pool import aextract_response, extract_response
+from src.telemetry import record_cache
+from src.utils import KeyedLeases
+
+
+# Internal pages worth fetching after the homepage, as (keyword, weight) pairs
+HIGH_VALUE_KEYWORDS = (
+    ("about", 10), ("team", 9), ("leadership", 9), ("management", 8), ("who-we-are", 8),
+    ("news", 7), ("press", 7), ("media", 5), ("announcement", 5),
+    ("product", 6), ("service", 6), ("solution", 5),
+    ("location", 4), ("office", 4), ("contact", 3),
+)
+# Links that never lead to useful HTML content
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".mp4", ".webp", ".css", ".js", ".xml")
+CACHE_NAMESPACE = "pages"
+
+# Async gates are bound to the event loop that created them
+_async_gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, KeyedLeases]" = weakref.WeakKeyDictionary()
+
+
+class _DomainGate:
+    """Per-domain politeness: bounded concurrency and a minimum gap between request starts."""
+    
+    def __init__(self) -> None:
+        self._slots = threading.BoundedSemaphore(Config.CRAWL_PER_DOMAIN)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    @contextmanager
+    def slot(self):
+        with self._slots:
+            with self._lock:
+                wait = self._next_start - time.monotonic()
+                self._next_start = max(self._next_start, time.monotonic()) + Config.CRAWL_DOMAIN_DELAY
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+class _AsyncDomainGate:
+    """Async counterpart of ``_DomainGate``."""
+    
+    def __init__(self) -> None:
+        self._slots = asyncio.Semaphore(Config.CRAWL_PER_DOMAIN)
+        self._next_start = 0.0
+    
+    @asynccontextmanager
+    async def slot(self):
+        async with self._slots:
+            wait = self._next_start - time.monotonic()
+            self._next_start = max(self._next_start, time.monotonic()) + Config.CRAWL_DOMAIN_DELAY
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+
+def _domain(url: str) -> str:
+    return urlparse(url).netloc.lower().removeprefix("www.")
+
+
+# A domain's gate is kept while a fetch uses or waits on it, and while idle only until its delay has passed
+_gates = KeyedLeases(_DomainGate, expires_at=lambda gate: gate._next_start)
+
+
+@contextmanager
+def _gate_slot(url: str):
+    """Hold a politeness slot for the URL's domain for the duration of a fetch."""
+    with _gates.lease(_domain(url)) as gate, gate.slot():
+        yield
+
+
+@asynccontextmanager
+async def _agate_slot(url: str):
+    """Async counterpart of ``_gate_slot``."""
+    loop = asyncio.get_running_loop()
+    gates = _async_gates.get(loop)
+    if gates is None:
+        gates = _async_gates[loop] = KeyedLeases(_AsyncDomainGate, expires_at=lambda gate: gate._next_start)
+    with gates.lease(_domain(url)) as gate:
+        async with gate.slot():
+            yield
+
+
+def _page_cache():
+    if not Config.CRAWL_CACHE_ENABLED:
+        return None
+    return get_cache(Config.CRAWL_CACHE_PATH, Config.CRAWL_CACHE_MAX_MB * 1024 * 1024)
+
+
+def _conditional_headers(cached: Optional[dict]) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from a cached entry's validators."""
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def _store(url: str, response, page: dict) -> dict:
+    """Cache a freshly downloaded page together with its validators."""
+    entry = {**page, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+    cache = _page_cache()
+    # Pages without validators cannot be revalidated, so caching them would only go stale
+    if cache is not None and (entry["etag"] or entry["last_modified"]):
+        cache.set(CACHE_NAMESPACE, url, entry, Config.CRAWL_CACHE_TTL)
+    return entry
+
+
+def fetch_page(url: str) -> dict:
+    """Fetch and extract one page, revalidating any cached copy with a conditional GET.
+    
+    Args:
+        url: The page URL
+        
+    Returns:
+        dict: The extracted page (see ``extract_response``) plus its 'etag' and 'last_modified' validators
+    """
+    cache = _page_cache()
+    cached = cache.get(CACHE_NAMESPACE, url) if cache is not None else None
+    with _gate_slot(url), http_client.stream("GET", url, headers=_conditional_headers(cached)) as response:
+        if response.status_code == 304 and cached:
+            print(f"PAGE NOT MODIFIED: {url}")
+            record_cache(CACHE_NAMESPACE, True)
+            cache.set(CACHE_NAMESPACE, url, cached, Config.CRAWL_CACHE_TTL)
+            return cached
+        if cache is not None:
+            record_cache(CACHE_NAMESPACE, False)
+        response.raise_for_status()
+        page = extract_response(response, Config.CRAWL_PAGE_MAX_CHARS, Config.SCRAPE_MAX_BYTES)
+        return _store(url, response, page)
+
+
+async def afetch_page(url: str) -> dict:
+    """Async counterpart of ``fetch_page``."""
+    cache = _page_cache()
+    cached = cache.get(CACHE_NAMESPACE, url) if cache is not None else None
+    async with _agate_slot(url), http_client.astream("GET", url, headers=_conditional_headers(cached)) as response:
+        if response.status_code == 304 and cached:
+            print(f"PAGE NOT MODIFIED: {url}")
+            record_cache(CACHE_NAMESPACE, True)
+            cache.set(CACHE_NAMESPACE, url, cached, Config.CRAWL_CACHE_TTL)
+            return cached
+        if cache is not None:
+            record_cache(CACHE_NAMESPACE, False)
+        response.raise_for_status()
+        page = await aextract_response(response, Config.CRAWL_PAGE_MAX_CHARS, Config.SCRAPE_MAX_BYTES)
+        return _store(url, response, page)
+
+
+def select_pages(base_url: str, links: List[Tuple[str, str]], limit: int) -> List[str]:
+    """Pick the highest-value internal pages linked from the homepage.
+    
+    Args:
+        base_url: The homepage URL the links were found on
+        links: (href, anchor text) pairs from the homepage
+        limit: Maximum number of pages to return
+        
+    Returns:
+        List[str]: Absolute URLs, best first
+    """
+    domain, scored, seen = _domain(base_url), {}, {base_url.rstrip("/")}
+    for href, text in links:
+        url = urldefrag(urljoin(base_url, href)).url
+        # /about and /about/ are the same page
+        if url.rstrip("/") in seen:
+            continue
+        seen.add(url.rstrip("/"))
+        parsed = urlparse(url)
+        path = parsed.path.lower()
+        if parsed.scheme not in ("http", "https") or _domain(url) != domain or not path.strip("/") or path.endswith(SKIPPED_EXTENSIONS):
+            continue
+        haystack = f"{path} {text.lower()}"
+        score = max((weight for keyword, weight in HIGH_VALUE_KEYWORDS if keyword in haystack), default=0)
+        if score:
+            # Prefer shallow pages: /about over /about/history/2019
+            scored[url] = score - path.strip("/").count("/")
+    return sorted(scored, key=scored.get, reverse=True)[:limit]
+
+
+def _format_site(pages: Dict[str, dict]) -> str:
+    sections = []
+    for url, page in pages.items():
+        if isinstance(page, Exception):
+            sections.append(f"## {url}\nError: {str(page)}")
+        else:
+            sections.append(f"## {url}\nTitle: {page['title']}\nMeta Description: {page['meta_description']}\nContent: {page['text']}")
+    return "\n\n".join(sections)
+
+
+def crawl_site(url: str, max_pages: Optional[int] = None) -> str:
+    """Fetch the homepage and then its most useful internal pages concurrently.
+    
+    Args:
+        url: The company homepage
+        max_pages: Total number of pages to fetch, homepage included (defaults to Config.CRAWL_MAX_PAGES)
+        
+    Returns:
+        str: One section per page with its title, meta description and content
+    """
+    max_pages = max_pages or Config.CRAWL_MAX_PAGES
+    homepage = fetch_page(url)
+    targets = select_pages(url, homepage.get("links", []), max_pages - 1)
+    pages = {url: homepage}
+    if targets:
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            futures = {target: pool.submit(fetch_page, target) for target in targets}
+            for target, future in futures.items():
+                try:
+                    pages[target] = future.result()
+                except Exception as e:
+                    pages[target] = e
+    return _format_site(pages)
+
+
+async def acrawl_site(url: str, max_pages: Optional[int] = None) -> str:
+    """Async counterpart of ``crawl_site``."""
+    max_pages = max_pages or Config.CRAWL_MAX_PAGES
+    homepage = await afetch_page(url)
+    targets = select_pages(url, homepage.get("links", []), max_pages - 1)
+    results = await asyncio.gather(*(afetch_page(target) for target in targets), return_exceptions=True)
+    return _format_site({url: homepage, **dict(zip(targets, results))})
\ No newline at end of file
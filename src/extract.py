@@ -0,0 +1,173 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import codecs
+from html.parser import HTMLParser
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+
+# Elements whose text is boilerplate or code rather than page content
+SKIP_TAGS = {"script", "style", "nav", "footer", "header", "noscript", "svg", "template", "iframe"}
+# Upper bound on the number of links recorded per page
+MAX_LINKS = 500
+# Elements that separate words, so their boundaries become spaces in the extracted text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "aside", "br", "li", "ul", "ol", "table", "tr", "td", "th",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "hr", "dd", "dt", "figcaption", "form", "label", "button", "a",
+}
+
+
+class PageExtractor(HTMLParser):
+    """Incremental, single-pass extractor for a page's title, meta description and main text.
+    
+    Unlike building a full BeautifulSoup tree, the extractor never holds more than the
+    text it keeps, and ``done`` turns True as soon as enough text has been collected so
+    the caller can stop downloading.
+    
+    Attributes:
+        max_chars: Number of content characters after which extraction is complete
+        title: The page title
+        meta_description: The meta (or og:) description
+        links: (href, anchor text) pairs seen so far, including those in navigation
+    """
+    
+    def __init__(self, max_chars: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.title = ""
+        self.meta_description = ""
+        self._og_description = ""
+        self.links = []
+        self._anchor = None
+        self._in_title = False
+        self._skip_depth = 0
+        self._parts = []
+        self._length = 0
+    
+    @property
+    def done(self) -> bool:
+        """Whether enough content has been collected."""
+        return self._length >= self.max_chars
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == "a" and len(self.links) < MAX_LINKS:
+            href = dict(attrs).get("href")
+            self._anchor = (href, []) if href else None
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            attributes = dict(attrs)
+            name = (attributes.get("name") or attributes.get("property") or "").lower()
+            if name == "description" and not self.meta_description:
+                self.meta_description = (attributes.get("content") or "").strip()
+            elif name == "og:description" and not self._og_description:
+                self._og_description = (attributes.get("content") or "").strip()
+        elif tag in BLOCK_TAGS:
+            self._parts.append(" ")
+    
+    def handle_endtag(self, tag):
+        if tag == "a" and self._anchor is not None:
+            href, text = self._anchor
+            self.links.append((href, " ".join("".join(text).split())))
+            self._anchor = None
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            self._parts.append(" ")
+    
+    def handle_data(self, data):
+        if self._anchor is not None:
+            self._anchor[1].append(data)
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth and not self.done:
+            if data.strip():
+                self._parts.append(data)
+                self._length += len(data)
+            else:
+                # A chunk boundary can leave the space between two words on its own
+                self._parts.append(" ")
+    
+    def result(self) -> Dict[str, str]:
+        """Return the extracted fields.
+        
+        Returns:
+            Dict[str, str]: The keys 'title', 'meta_description', 'text' and 'links'
+        """
+        text = " ".join("".join(self._parts).split())
+        return {
+            "title": " ".join(self.title.split()),
+            "meta_description": self.meta_description or self._og_description,
+            "text": text[:self.max_chars],
+            "links": self.links,
+        }
+
+
+def _decoder(encoding: Optional[str]):
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def extract_stream(chunks: Iterable[bytes], max_chars: int, max_bytes: int, encoding: Optional[str] = None) -> Dict[str, str]:
+    """Extract page content from a stream of body chunks, stopping early when possible.
+    
+    Args:
+        chunks: The response body as an iterable of byte chunks
+        max_chars: Number of content characters to keep
+        max_bytes: Maximum number of bytes to read from ``chunks``
+        encoding: Character encoding of the body (UTF-8 if unknown)
+        
+    Returns:
+        Dict[str, str]: The keys 'title', 'meta_description', 'text', 'links' and 'bytes_read'
+    """
+    extractor, decoder, read = PageExtractor(max_chars), _decoder(encoding), 0
+    for chunk in chunks:
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done or read >= max_bytes:
+            break
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+    return {**extractor.result(), "bytes_read": read}
+
+
+async def aextract_stream(chunks: AsyncIterator[bytes], max_chars: int, max_bytes: int, encoding: Optional[str] = None) -> Dict[str, str]:
+    """Async counterpart of ``extract_stream``."""
+    extractor, decoder, read = PageExtractor(max_chars), _decoder(encoding), 0
+    async for chunk in chunks:
+        chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done or read >= max_bytes:
+            break
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+    return {**extractor.result(), "bytes_read": read}
+
+
+def extract_html(content: bytes, max_chars: int, encoding: Optional[str] = None) -> Dict[str, str]:
+    """Extract page content from an already downloaded body.
+    
+    Args:
+        content: The response body
+        max_chars: Number of content characters to keep
+        encoding: Character encoding of the body (UTF-8 if unknown)
+        
+    Returns:
+        Dict[str, str]: The keys 'title', 'meta_description', 'text', 'links' and 'bytes_read'
+    """
+    return extract_stream([content], max_chars, len(content), encoding)
+
+
+def format_page(page: Dict[str, str]) -> str:
+    """Render extracted page content in the scrape tool's output format."""
+    return f"Title: {page['title']}\nMeta Description: {page['meta_description']}\nContent: {page['text']}..."
\ No newline at end of file
@@ -0,0 +1,140 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+from src.validation import REQUIRED_SECTIONS
+
+
+FILLER = (
+    "The company continues to focus on its core customers while expanding selectively into adjacent markets. "
+    "Public sources point to steady demand, a recognisable brand and an experienced leadership team. "
+    "Data on revenue and headcount is limited, so figures should be confirmed during discovery. "
+)
+LINK_PATTERN = re.compile(r"https?://[^\s)\]\"']+")
+# Words per streamed chunk, roughly what the OpenAI API sends per token event
+STREAM_WORDS = 2
+
+
+class ScriptedChatModel(BaseChatModel):
+    """A deterministic, offline stand-in for the OpenAI chat model.
+    
+    It answers the researcher and rewriter prompts with a well-formed report built from the
+    links in the prompt, the reviewer's structured-output call with an EvalSchema tool call,
+    a news refresh with an updated section and the research agent with a plain reply. Latency and failures can be injected to
+    exercise the graph under load. When a streaming callback is attached the report is
+    streamed a couple of words at a time.
+    
+    Attributes:
+        model_name: Name reported to callbacks and caches
+        latency: Seconds each call takes
+        error_rate: Probability (0-1) that a call raises an error
+        rewrite_rate: Probability (0-1) that a review asks for a rewrite
+        seed: Seed for the injected randomness
+    """
+    
+    model_name: str = "scripted-fake"
+    latency: float = 0.0
+    error_rate: float = 0.0
+    rewrite_rate: float = 0.0
+    seed: int = 0
+    _rng: random.Random = PrivateAttr()
+    
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+    
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+    
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name}
+    
+    def bind_tools(self, tools, **kwargs):
+        """Bind tools by name, the same way ChatOpenAI passes them to the API."""
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+    
+    def _respond(self, messages: List[BaseMessage], tools: Optional[list]) -> ChatResult:
+        if self._rng.random() < self.error_rate:
+            raise RuntimeError("Injected fake LLM failure")
+        
+        prompt = "\n".join(str(message.content) for message in messages)
+        tool_names = {tool["function"]["name"] for tool in tools or []}
+        if "EvalSchema" in tool_names:
+            rewrite = self._rng.random() < self.rewrite_rate
+            args = {"score": 5 if rewrite else 8, "rewrite": rewrite, "evaluation": "Scripted evaluation."}
+            message = AIMessage(content="", tool_calls=[{"name": "EvalSchema", "args": args, "id": "call_eval"}])
+        elif tool_names:
+            # The research agent only fills evidence gaps; the scripted one leaves them as they are
+            message = AIMessage(content="done")
+        elif "Reply with the updated section text only" in prompt:
+            links = list(dict.fromkeys(LINK_PATTERN.findall(prompt)))[-3:] or ["https://example.com"]
+            message = AIMessage(content="\n".join([FILLER] + [f"- Update: {link}" for link in links]))
+        else:
+            message = AIMessage(content=self._report(prompt))
+        
+        input_tokens = len(prompt) // 4
+        output_tokens = max(len(str(message.content)) // 4, 1)
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _report(self, prompt: str) -> str:
+        """Render a report with a fact sheet, every required section and the prompt's source links."""
+        links = list(dict.fromkeys(LINK_PATTERN.findall(prompt)))[:12] or ["https://example.com"]
+        lines = ["# EXECUTIVE FACT SHEET", "- Company snapshot: see sources below", f"- Website: {links[0]}", "", "# DETAILED RESEARCH REPORT"]
+        for index, section in enumerate(REQUIRED_SECTIONS):
+            lines += ["", f"## {section}", FILLER * 3, f"Source: {links[index % len(links)]}"]
+        return "\n".join(lines)
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._respond(messages, kwargs.get("tools"))
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._respond(messages, kwargs.get("tools"))
+    
+    def _chunks(self, result: ChatResult) -> Iterator[ChatGenerationChunk]:
+        """Split a scripted response into streaming chunks; usage is reported on the last one."""
+        message = result.generations[0].message
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks, usage_metadata=message.usage_metadata))
+            return
+        words = re.findall(r"\S+\s*", message.content)
+        for start in range(0, len(words), STREAM_WORDS):
+            last = start + STREAM_WORDS >= len(words)
+            content = "".join(words[start:start + STREAM_WORDS])
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content, usage_metadata=message.usage_metadata if last else None))
+    
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+    
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages, kwargs.get("tools"))):
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
@@ -0,0 +1,256 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.config import Config
+from src.utils import KeyedLeases
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+# Per-host semaphores exist only while a request to the host is running or waiting
+_host_slots = KeyedLeases(lambda: threading.BoundedSemaphore(Config.HTTP_MAX_PER_HOST))
+# Async clients and semaphores are bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, KeyedLeases]" = weakref.WeakKeyDictionary()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=30,
+    )
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide keep-alive HTTP client, creating it on first use.
+    
+    Returns:
+        httpx.Client: The shared synchronous client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(headers=DEFAULT_HEADERS, limits=_limits(), timeout=Config.HTTP_TIMEOUT, follow_redirects=True)
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the keep-alive async HTTP client for the running event loop.
+    
+    Returns:
+        httpx.AsyncClient: The shared asynchronous client
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(headers=DEFAULT_HEADERS, limits=_limits(), timeout=Config.HTTP_TIMEOUT, follow_redirects=True)
+        _async_clients[loop] = client
+    return client
+
+
+@contextmanager
+def _host_slot(url: str):
+    """Hold one of the per-host connection slots for the duration of a request."""
+    with _host_slots.lease(urlparse(url).netloc) as slot, slot:
+        yield
+
+
+@asynccontextmanager
+async def _ahost_slot(url: str):
+    """Async counterpart of ``_host_slot``."""
+    loop = asyncio.get_running_loop()
+    slots = _async_host_slots.get(loop)
+    if slots is None:
+        slots = _async_host_slots[loop] = KeyedLeases(lambda: asyncio.Semaphore(Config.HTTP_MAX_PER_HOST))
+    with slots.lease(urlparse(url).netloc) as slot:
+        async with slot:
+            yield
+
+
+def retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Return the wait a response's Retry-After header asks for (seconds or HTTP date), capped at HTTP_MAX_BACKOFF.
+    
+    Args:
+        response: The response, if one was received
+        
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return min(float(value), Config.HTTP_MAX_BACKOFF)
+    except ValueError:
+        try:
+            return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0), Config.HTTP_MAX_BACKOFF)
+        except (TypeError, ValueError):
+            return None
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Work out how long to wait before the next attempt.
+    
+    A Retry-After header (seconds or HTTP date) wins; otherwise the delay is an
+    exponential backoff with full jitter.
+    
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+        response: The failed response, if one was received
+        
+    Returns:
+        float: Seconds to wait
+    """
+    delay = retry_after(response)
+    if delay is not None:
+        return delay
+    return random.uniform(0, min(Config.HTTP_BACKOFF_BASE * (2 ** attempt), Config.HTTP_MAX_BACKOFF))
+
+
+def request(method: str, url: str, limiter=None, **kwargs) -> httpx.Response:
+    """Send a request through the shared client, retrying 429/5xx and transport errors.
+    
+    Args:
+        method: HTTP method
+        url: Target URL
+        limiter: Optional ``rate_limit.RateLimiter`` every attempt is sent through
+        **kwargs: Passed through to ``httpx.Client.request``
+        
+    Returns:
+        httpx.Response: The final response (which may still be an error status)
+    """
+    client = get_client()
+    for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+        final = attempt == Config.HTTP_MAX_RETRIES
+        try:
+            with (limiter.slot() if limiter is not None else nullcontext()), _host_slot(url):
+                response = client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if final:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+        if limiter is not None:
+            limiter.record_response(response)
+        if final or response.status_code not in RETRY_STATUSES:
+            return response
+        time.sleep(retry_delay(attempt, response))
+
+
+async def arequest(method: str, url: str, limiter=None, **kwargs) -> httpx.Response:
+    """Async counterpart of ``request``.
+    
+    Args:
+        method: HTTP method
+        url: Target URL
+        limiter: Optional ``rate_limit.RateLimiter`` every attempt is sent through
+        **kwargs: Passed through to ``httpx.AsyncClient.request``
+        
+    Returns:
+        httpx.Response: The final response (which may still be an error status)
+    """
+    client = get_async_client()
+    for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+        final = attempt == Config.HTTP_MAX_RETRIES
+        try:
+            async with (limiter.aslot() if limiter is not None else nullcontext()), _ahost_slot(url):
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if final:
+                raise
+            await asyncio.sleep(retry_delay(attempt))
+            continue
+        if limiter is not None:
+            limiter.record_response(response)
+        if final or response.status_code not in RETRY_STATUSES:
+            return response
+        await asyncio.sleep(retry_delay(attempt, response))
+
+
+@contextmanager
+def stream(method: str, url: str, **kwargs):
+    """Open a streamed response through the shared client, retrying like ``request``.
+    
+    Retries happen before the body is read; the yielded response holds its per-host
+    slot until the caller leaves the ``with`` block, which also closes the connection
+    if the body was not fully consumed.
+    
+    Args:
+        method: HTTP method
+        url: Target URL
+        **kwargs: Passed through to ``httpx.Client.stream``
+        
+    Yields:
+        httpx.Response: The response, with its body not yet read
+    """
+    client = get_client()
+    for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+        final = attempt == Config.HTTP_MAX_RETRIES
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(_host_slot(url))
+                response = stack.enter_context(client.stream(method, url, **kwargs))
+            except httpx.TransportError:
+                if final:
+                    raise
+                delay = retry_delay(attempt)
+            else:
+                if final or response.status_code not in RETRY_STATUSES:
+                    yield response
+                    return
+                delay = retry_delay(attempt, response)
+        time.sleep(delay)
+
+
+@asynccontextmanager
+async def astream(method: str, url: str, **kwargs):
+    """Async counterpart of ``stream``."""
+    client = get_async_client()
+    for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+        final = attempt == Config.HTTP_MAX_RETRIES
+        async with AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(_ahost_slot(url))
+                response = await stack.enter_async_context(client.stream(method, url, **kwargs))
+            except httpx.TransportError:
+                if final:
+                    raise
+                delay = retry_delay(attempt)
+            else:
+                if final or response.status_code not in RETRY_STATUSES:
+                    yield response
+                    return
+                delay = retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    """Send a GET request through the shared client. See ``request``."""
+    return request("GET", url, **kwargs)
+
+
+async def aget(url: str, **kwargs) -> httpx.Response:
+    """Send a GET request through the shared async client. See ``arequest``."""
+    return await arequest("GET", url, **kwargs)
\ No newline at end of file
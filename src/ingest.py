@@ -0,0 +1,153 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import json
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+import xxhash
+
+from src.config import Config
+from src.report_store import get_report_store
+from src.telemetry import METRICS
+from src.utils import normalize_domain
+
+
+# Accepted column names, matched case-insensitively, in order of preference
+WEBSITE_COLUMNS = ("company_website", "website", "url", "domain")
+NAME_COLUMNS = ("company_name", "name", "company")
+INDUSTRY_COLUMNS = ("industry", "sector")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def _columns(keys: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    """Map each group of accepted column names onto the matching keys of a row, in order of preference."""
+    lowered = {str(key).strip().lower(): key for key in keys}
+    return tuple(
+        tuple(lowered[column] for column in columns if column in lowered)
+        for columns in (WEBSITE_COLUMNS, NAME_COLUMNS, INDUSTRY_COLUMNS)
+    )
+
+
+def _pick(record: Dict[str, Any], keys: Tuple[str, ...]) -> str:
+    """Return the first non-empty value among the given keys."""
+    for key in keys:
+        value = record.get(key)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ""
+
+
+def read_records(path: str, chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily read the rows of a CSV or JSONL company list.
+
+    CSV files are parsed ``chunk_size`` rows at a time and JSONL files line by line, so only
+    one chunk is held in memory. Malformed JSONL lines are reported and skipped.
+
+    Args:
+        path: The company list; ``.jsonl``/``.ndjson`` files are read as JSONL, anything else as CSV
+        chunk_size: Rows parsed per CSV chunk (defaults to Config.INGEST_CHUNK_SIZE)
+
+    Returns:
+        Iterator[Dict[str, Any]]: One dict per row, keyed by column name
+    """
+    if path.lower().endswith(JSONL_SUFFIXES):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Skipping line {line_number} of {path}: {e}")
+                    continue
+                if isinstance(record, dict):
+                    yield record
+        return
+
+    chunks = pd.read_csv(path, chunksize=chunk_size or Config.INGEST_CHUNK_SIZE, dtype=str, keep_default_na=False, skipinitialspace=True)
+    for chunk in chunks:
+        yield from chunk.to_dict("records")
+
+
+class CompanyIngest:
+    """Streams (company_name, company_website, industry) tuples out of a company list.
+
+    Rows are read lazily, each website is reduced to its normalized domain and only the
+    first row per domain is kept. Seen domains are remembered as 64-bit xxhash digests
+    rather than strings, which keeps the set small for million-row inputs. Companies
+    whose latest stored report is younger than ``fresh_days`` are skipped. Rows without a
+    usable website are dropped. A row without a company name is named after its domain.
+
+    Attributes:
+        path: The company list
+        rows: Rows read so far
+        companies: Companies yielded so far
+        duplicates: Rows skipped because their domain was already seen
+        fresh: Companies skipped because they have a fresh report for the same industry
+        invalid: Rows skipped because they have no usable website
+    """
+
+    def __init__(self, path: str, chunk_size: Optional[int] = None, fresh_days: Optional[float] = None) -> None:
+        """Initialize the ingest.
+
+        Args:
+            path: The company list, CSV or JSONL
+            chunk_size: Rows parsed per CSV chunk (defaults to Config.INGEST_CHUNK_SIZE)
+            fresh_days: Skip companies whose latest stored report is younger than this many days and
+                matches their industry, like the graph's check_freshness; 0 never skips (defaults
+                to Config.REPORT_FRESH_DAYS)
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.fresh_days = Config.REPORT_FRESH_DAYS if fresh_days is None else fresh_days
+        self.rows = self.companies = self.duplicates = self.fresh = self.invalid = 0
+
+    def _skip(self, reason: str) -> None:
+        setattr(self, reason, getattr(self, reason) + 1)
+        METRICS.inc("research_ingest_rows_total", result=reason)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str]]:
+        seen = set()
+        store = get_report_store() if self.fresh_days > 0 else None
+        cutoff = time.time() - self.fresh_days * 24 * 3600
+
+        # Rows of a CSV (and usually of a JSONL file) share their keys, so columns are matched once per layout
+        layouts = {}
+
+        for record in read_records(self.path, self.chunk_size):
+            self.rows += 1
+            keys = tuple(record)
+            if keys not in layouts:
+                layouts[keys] = _columns(keys)
+            website_keys, name_keys, industry_keys = layouts[keys]
+            website = _pick(record, website_keys)
+            domain = normalize_domain(website)
+            if not domain:
+                self._skip("invalid")
+                continue
+            digest = xxhash.xxh64_intdigest(domain)
+            if digest in seen:
+                self._skip("duplicates")
+                continue
+            seen.add(digest)
+
+            industry = _pick(record, industry_keys)
+            if store is not None:
+                # Same criteria as the graph's check_freshness, so only reports it would reuse are skipped
+                created_at = store.latest_created_at(domain, industry)
+                if created_at is not None and created_at >= cutoff:
+                    self._skip("fresh")
+                    continue
+            company_name = _pick(record, name_keys) or domain.split(".")[0].upper()
+            self.companies += 1
+            METRICS.inc("research_ingest_rows_total", result="queued")
+            yield company_name, website.split()[0], industry
+
+    def summary(self) -> str:
+        return (f"Read {self.rows} rows from {self.path}: {self.companies} companies queued, {self.duplicates} duplicate domains, "
+                f"{self.fresh} with a fresh report, {self.invalid} without a website")
+
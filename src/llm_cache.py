@@ -0,0 +1,85 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import hashlib
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from src.cache import ResponseCache, get_cache
+from src.config import Config
+from src.telemetry import record_cache
+
+
+NAMESPACE = "llm"
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache that stores chat model responses in a ResponseCache.
+
+    Entries are keyed by a hash of the model's identity string (model name, temperature,
+    stop words and bound tool schemas) and the serialised prompt messages, so any change
+    to the prompt, the evidence or the model misses the cache. Replayed responses carry
+    no token usage, since no tokens were spent on them.
+
+    Attributes:
+        cache: The underlying ResponseCache
+        ttl: Seconds a response is kept
+    """
+
+    def __init__(self, cache: ResponseCache, ttl: float) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache: The underlying ResponseCache
+            ttl: Seconds a response is kept
+        """
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Return the cached generations for a prompt and model, or None on a miss."""
+        value = self.cache.get(NAMESPACE, self._key(prompt, llm_string))
+        record_cache(NAMESPACE, value is not None)
+        if value is None:
+            return None
+        generations = []
+        for item in value:
+            message = messages_from_dict([item["message"]])[0]
+            message.usage_metadata = None
+            message.response_metadata = {**message.response_metadata, "cached": True}
+            generations.append(ChatGeneration(message=message, generation_info=item.get("generation_info")))
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Store the generations for a prompt and model; non-chat generations are not cached."""
+        if not all(isinstance(generation, ChatGeneration) for generation in return_val):
+            return
+        value = [
+            {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+            for generation in return_val
+        ]
+        self.cache.set(NAMESPACE, self._key(prompt, llm_string), value, self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every cached response."""
+        self.cache.clear(NAMESPACE)
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the LLM response cache, or None when it is disabled.
+
+    Returns:
+        Optional[LLMResponseCache]: The cache backed by Config.LLM_CACHE_PATH
+    """
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    return LLMResponseCache(get_cache(Config.LLM_CACHE_PATH, Config.LLM_CACHE_MAX_MB * 1024 * 1024), Config.LLM_CACHE_TTL)
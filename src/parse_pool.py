@@ -0,0 +1,180 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from src.config import Config
+from src.extract import aextract_stream, extract_html, extract_stream
+from src.telemetry import METRICS
+
+
+class ParsePool:
+    """Extracts downloaded pages in a pool of worker processes.
+
+    Parsing is CPU-bound, so in a busy batch a few very large pages parsed on the threads
+    and event loop that drive the HTTP and LLM calls hold everything else up. The pool
+    moves that work onto other cores. Workers are started with ``spawn`` (forking a
+    process that runs threads is unsafe) and replaced after ``max_tasks_per_child``
+    pages so that a leak in one cannot grow without bound. At most ``queue_size`` pages
+    wait for or occupy a worker at once; further callers wait for a slot. If the pool
+    breaks (a worker crashed), the pages caught in it are parsed inline and a new pool is
+    started for the next ones.
+
+    Attributes:
+        workers: Number of worker processes
+        max_tasks_per_child: Pages a worker parses before it is replaced
+        queue_size: Most pages submitted to the pool at once
+    """
+
+    def __init__(self, workers: int, max_tasks_per_child: int, queue_size: int) -> None:
+        """Initialize the pool; worker processes are started on first use.
+
+        Args:
+            workers: Number of worker processes
+            max_tasks_per_child: Pages a worker parses before it is replaced
+            queue_size: Most pages submitted to the pool at once
+        """
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.queue_size = queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(queue_size)
+        # asyncio semaphores belong to the loop they are first used on
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child or None,
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, error: Exception) -> None:
+        """Replace a pool that broke or was shut down; only the first caller to notice does it."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        print(f"Parse pool broke, starting a new one: {str(error)}")
+        METRICS.inc("research_parse_pool_restarts_total")
+        # Pages still queued on a broken pool fail with BrokenProcessPool and are parsed inline
+        executor.shutdown(wait=False)
+
+    def _submit(self, content: bytes, max_chars: int, encoding: Optional[str]) -> Tuple[ProcessPoolExecutor, Future]:
+        """Submit a page, resubmitting once if the pool broke or was replaced by another caller meanwhile."""
+        executor = self._pool()
+        try:
+            return executor, executor.submit(extract_html, content, max_chars, encoding)
+        except RuntimeError as e:
+            # BrokenProcessPool, or "cannot schedule new futures after shutdown"
+            self._discard(executor, e)
+        executor = self._pool()
+        return executor, executor.submit(extract_html, content, max_chars, encoding)
+
+    def parse(self, content: bytes, max_chars: int, encoding: Optional[str] = None) -> Dict[str, str]:
+        """Extract a downloaded page in a worker process (see ``extract_html``)."""
+        with self._slots:
+            try:
+                executor, future = self._submit(content, max_chars, encoding)
+            except RuntimeError as e:
+                print(f"Parse pool unavailable, parsing inline: {str(e)}")
+            else:
+                try:
+                    return future.result()
+                except BrokenProcessPool as e:
+                    self._discard(executor, e)
+        return extract_html(content, max_chars, encoding)
+
+    async def aparse(self, content: bytes, max_chars: int, encoding: Optional[str] = None) -> Dict[str, str]:
+        """Async counterpart of ``parse``."""
+        slots = self._async_slots.setdefault(asyncio.get_running_loop(), asyncio.Semaphore(self.queue_size))
+        async with slots:
+            try:
+                executor, future = self._submit(content, max_chars, encoding)
+            except RuntimeError as e:
+                print(f"Parse pool unavailable, parsing inline: {str(e)}")
+            else:
+                try:
+                    return await asyncio.wrap_future(future)
+                except BrokenProcessPool as e:
+                    self._discard(executor, e)
+        return extract_html(content, max_chars, encoding)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_parse_pool() -> Optional[ParsePool]:
+    """Return the process-wide parse pool, or None when pages are parsed inline.
+
+    Returns:
+        Optional[ParsePool]: The pool configured by Config.PARSE_WORKERS
+    """
+    if Config.PARSE_WORKERS <= 0:
+        return None
+    return ParsePool(Config.PARSE_WORKERS, Config.PARSE_MAX_TASKS_PER_CHILD, Config.PARSE_QUEUE_SIZE or Config.PARSE_WORKERS * 4)
+
+
+def _read(chunks: Iterable[bytes], max_bytes: int) -> bytes:
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk[:max_bytes - len(body)]
+        if len(body) >= max_bytes:
+            break
+    return bytes(body)
+
+
+async def _aread(chunks: AsyncIterator[bytes], max_bytes: int) -> bytes:
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk[:max_bytes - len(body)]
+        if len(body) >= max_bytes:
+            break
+    return bytes(body)
+
+
+def extract_response(response, max_chars: int, max_bytes: int) -> Dict[str, str]:
+    """Extract the page content of a streamed HTTP response.
+
+    Without a parse pool the body is parsed while it downloads, stopping as soon as
+    enough text has been collected. With one, the body (up to ``max_bytes``) is
+    downloaded first and parsed in a worker process.
+
+    Args:
+        response: An httpx response opened with ``http_client.stream``
+        max_chars: Number of content characters to keep
+        max_bytes: Maximum number of bytes to read from the body
+
+    Returns:
+        Dict[str, str]: The keys 'title', 'meta_description', 'text', 'links' and 'bytes_read'
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return extract_stream(response.iter_bytes(), max_chars, max_bytes, response.charset_encoding)
+    return pool.parse(_read(response.iter_bytes(), max_bytes), max_chars, response.charset_encoding)
+
+
+async def aextract_response(response, max_chars: int, max_bytes: int) -> Dict[str, str]:
+    """Async counterpart of ``extract_response`` for a response opened with ``http_client.astream``."""
+    pool = get_parse_pool()
+    if pool is None:
+        return await aextract_stream(response.aiter_bytes(), max_chars, max_bytes, response.charset_encoding)
+    return await pool.aparse(await _aread(response.aiter_bytes(), max_bytes), max_chars, response.charset_encoding)
@@ -0,0 +1,405 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+"""Process-wide rate limiting for the OpenAI and SerpAPI quotas.
+
+Every provider gets a ``RateLimiter`` with token buckets for requests per minute and
+(for LLMs) tokens per minute, plus an adaptive concurrency limit: it halves whenever the
+provider answers 429 and creeps back up as calls succeed (AIMD), so a batch settles just
+below the real quota instead of hammering it. ``RateLimitedChatModel`` puts a chat model
+behind the limiter, estimating each call's token cost before it is sent.
+"""
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableBinding, RunnableSequence
+
+from src import http_client
+from src.compaction import count_tokens
+from src.config import Config
+from src.telemetry import METRICS
+
+
+# Seconds between checks while an async caller waits for a free concurrency slot
+POLL_INTERVAL = 0.05
+# A burst of 429s from calls that were already in flight only counts as one signal
+DECREASE_INTERVAL = 1.0
+# Statuses the OpenAI SDK retries on top of http_client.RETRY_STATUSES: request timeout and lock conflict
+SDK_RETRY_STATUSES = {408, 409}
+
+
+class TokenBucket:
+    """A thread-safe token bucket that hands out reservations.
+
+    A reservation takes its tokens immediately, even if that leaves the bucket in debt,
+    and returns how long the caller must wait for the debt to be refilled. Callers are
+    therefore served in the order they reserve, and sync and async callers share one budget.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Most tokens the bucket holds (its burst size)
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens the bucket holds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them.
+
+        Args:
+            amount: Tokens needed; anything above the capacity is charged as the capacity
+
+        Returns:
+            float: Seconds to wait (0 if the tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._level -= min(amount, self.capacity)
+            return max(-self._level / self.rate, 0.0)
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) tokens after the real cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """Request and token budgets plus an adaptive concurrency limit for one provider.
+
+    Attributes:
+        name: Provider name, used in metrics
+        max_concurrency: Upper bound of the adaptive concurrency limit
+        limit: Current concurrency limit
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float = 0, max_concurrency: int = 16) -> None:
+        """Initialize the limiter.
+
+        Args:
+            name: Provider name, used in metrics
+            requests_per_minute: Request budget (0 for unlimited)
+            tokens_per_minute: Token budget (0 for unlimited)
+            max_concurrency: Most calls in flight at once
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self._requests = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute > 0 else None
+        self._active = 0
+        self._blocked_until = 0.0
+        self._decreased_at = float("-inf")
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        METRICS.set("research_rate_limit_concurrency", self.limit, provider=name)
+
+    def _reserve(self, tokens: float) -> float:
+        """Reserve one request and ``tokens`` tokens; return the seconds to wait, including any cooldown."""
+        wait = self._requests.reserve(1) if self._requests else 0.0
+        if self._tokens and tokens:
+            wait = max(wait, self._tokens.reserve(tokens))
+        return max(wait, self._blocked_until - time.monotonic())
+
+    def _can_enter(self) -> bool:
+        """Whether a new call may start now. Called with the lock held."""
+        return self._active < max(int(self.limit), 1) and time.monotonic() >= self._blocked_until
+
+    def _try_enter(self) -> bool:
+        with self._lock:
+            if self._can_enter():
+                self._active += 1
+                return True
+            return False
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._released.notify()
+
+    @contextmanager
+    def slot(self, tokens: float = 0) -> Iterator[None]:
+        """Wait for budget and a concurrency slot, and hold the slot for the duration of a call.
+
+        Args:
+            tokens: Estimated token cost of the call
+        """
+        started = time.monotonic()
+        time.sleep(self._reserve(tokens))
+        with self._lock:
+            while not self._can_enter():
+                self._released.wait(timeout=max(self._blocked_until - time.monotonic(), POLL_INTERVAL))
+            self._active += 1
+        METRICS.observe("research_rate_limit_wait_seconds", time.monotonic() - started, provider=self.name)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def aslot(self, tokens: float = 0) -> AsyncIterator[None]:
+        """Async counterpart of ``slot``."""
+        started = time.monotonic()
+        await asyncio.sleep(self._reserve(tokens))
+        while not self._try_enter():
+            await asyncio.sleep(max(self._blocked_until - time.monotonic(), POLL_INTERVAL))
+        METRICS.observe("research_rate_limit_wait_seconds", time.monotonic() - started, provider=self.name)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def record(self, status_code: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Feed a call's outcome back into the concurrency limit.
+
+        A 429 or a 5xx server error means the provider is overloaded: it halves the limit (at
+        most once per ``DECREASE_INTERVAL``) and pauses new calls for ``retry_after`` seconds.
+        Any other outcome grows the limit by roughly one slot per ``limit`` successful calls.
+
+        Args:
+            status_code: HTTP status of the response, or None for a successful non-HTTP call
+            retry_after: Seconds the provider asked us to wait, if it said
+        """
+        with self._lock:
+            if status_code is not None and (status_code == 429 or status_code >= 500):
+                now = time.monotonic()
+                if now - self._decreased_at >= DECREASE_INTERVAL:
+                    self.limit = max(self.limit / 2, 1.0)
+                    self._decreased_at = now
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                if status_code == 429:
+                    METRICS.inc("research_rate_limited_total", provider=self.name)
+                    print(f"RATE LIMITED BY {self.name.upper()}: concurrency limit lowered to {int(self.limit)}")
+                else:
+                    print(f"{self.name.upper()} RETURNED {status_code}: concurrency limit lowered to {int(self.limit)}")
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            METRICS.set("research_rate_limit_concurrency", self.limit, provider=self.name)
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Feed an HTTP response back into the concurrency limit. See ``record``."""
+        self.record(response.status_code, http_client.retry_after(response))
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct the token budget once a call's real token usage is known.
+
+        Args:
+            estimated: Tokens reserved before the call
+            actual: Tokens the provider reported
+        """
+        if self._tokens and actual:
+            self._tokens.adjust(estimated - actual)
+
+
+@lru_cache(maxsize=None)
+def get_limiter(provider: str) -> RateLimiter:
+    """Return the process-wide limiter for ``provider`` ("openai" or "serpapi").
+
+    Args:
+        provider: The provider name
+
+    Returns:
+        RateLimiter: The shared limiter, configured from Config
+    """
+    if provider == "openai":
+        return RateLimiter("openai", Config.OPENAI_RPM, Config.OPENAI_TPM, Config.OPENAI_MAX_CONCURRENCY)
+    if provider == "serpapi":
+        return RateLimiter("serpapi", Config.SERPAPI_RPM, 0, Config.SERPAPI_MAX_CONCURRENCY)
+    raise ValueError(f"Unknown rate-limited provider: {provider}")
+
+
+def serpapi_limiter() -> Optional[RateLimiter]:
+    """Return the SerpAPI limiter, or None when rate limiting is disabled."""
+    return get_limiter("serpapi") if Config.RATE_LIMIT_ENABLED else None
+
+
+def _status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an SDK error (openai.APIStatusError and friends), if any."""
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an error is a connection failure or timeout, which carries no HTTP status."""
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    try:
+        import openai
+    except ImportError:
+        return False
+    # APITimeoutError is a subclass
+    return isinstance(error, openai.APIConnectionError)
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """A chat model that sends every call through a provider's ``RateLimiter``.
+
+    The token cost of a call is estimated from its messages and tools plus
+    ``Config.LLM_COMPLETION_TOKENS`` before it is sent, and corrected from the reported
+    usage afterwards. Rate-limit, transient server, connection and timeout errors are
+    retried with the same backoff as ``http_client``, honouring Retry-After; only rate-limit
+    and server errors feed the adaptive concurrency limit.
+
+    Attributes:
+        inner: The wrapped chat model
+        provider: Name of the limiter to use
+    """
+
+    inner: BaseChatModel
+    provider: str = "openai"
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.inner._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return self.inner._identifying_params
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        return self.inner._get_ls_params(stop=stop, **kwargs)
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return get_limiter(self.provider)
+
+    def _rebind(self, runnable: Any) -> Optional[Any]:
+        """Re-point a binding of ``inner`` (as returned by its bind_tools) at this wrapper."""
+        if isinstance(runnable, RunnableBinding) and runnable.bound is self.inner:
+            return self.bind(**runnable.kwargs)
+        return None
+
+    def bind_tools(self, tools, **kwargs):
+        """Bind tools the way the wrapped model does, keeping calls behind the limiter."""
+        bound = self.inner.bind_tools(tools, **kwargs)
+        return self._rebind(bound) or bound
+
+    def with_structured_output(self, schema, **kwargs):
+        """Use the wrapped model's structured output method, keeping calls behind the limiter."""
+        structured = self.inner.with_structured_output(schema, **kwargs)
+        if isinstance(structured, RunnableSequence):
+            first = self._rebind(structured.first)
+            if first is not None:
+                return RunnableSequence(first, *structured.middle, structured.last, name=structured.name)
+        return super().with_structured_output(schema, **kwargs)
+
+    def _estimate(self, messages: List[Any], kwargs: dict) -> int:
+        """Estimate a call's token cost: prompt, tool schemas and the expected completion."""
+        prompt = sum(count_tokens(message.content if isinstance(message.content, str) else json.dumps(message.content)) for message in messages)
+        if kwargs.get("tools"):
+            prompt += count_tokens(json.dumps(kwargs["tools"], default=str))
+        return prompt + Config.LLM_COMPLETION_TOKENS
+
+    def _retry(self, error: Exception, attempt: int) -> float:
+        """Record a failed attempt and return the delay before retrying, or re-raise if it is not retryable."""
+        status = _status(error)
+        response = getattr(error, "response", None)
+        response = response if isinstance(response, httpx.Response) else None
+        retryable = status in http_client.RETRY_STATUSES or status in SDK_RETRY_STATUSES or (status is None and _is_transient(error))
+        if not retryable or attempt == Config.HTTP_MAX_RETRIES:
+            raise error
+        if status in http_client.RETRY_STATUSES:
+            self.limiter.record(status, http_client.retry_after(response) if response is not None else None)
+        return http_client.retry_delay(attempt, response)
+
+    def _settle(self, estimated: int, usage: Optional[dict]) -> None:
+        self.limiter.record(None)
+        if usage:
+            self.limiter.settle(estimated, usage.get("total_tokens", 0))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        estimated = self._estimate(messages, kwargs)
+        for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+            try:
+                with self.limiter.slot(estimated):
+                    result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                time.sleep(self._retry(e, attempt))
+                continue
+            self._settle(estimated, getattr(result.generations[0].message, "usage_metadata", None) if result.generations else None)
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        estimated = self._estimate(messages, kwargs)
+        for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+            try:
+                async with self.limiter.aslot(estimated):
+                    result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._retry(e, attempt))
+                continue
+            self._settle(estimated, getattr(result.generations[0].message, "usage_metadata", None) if result.generations else None)
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        estimated = self._estimate(messages, kwargs)
+        if type(self.inner)._stream is BaseChatModel._stream:
+            # The wrapped model cannot stream: send the whole response as one chunk
+            message = self._generate(messages, stop=stop, run_manager=run_manager, **kwargs).generations[0].message
+            yield ChatGenerationChunk(message=AIMessageChunk(**message.model_dump(exclude={"type"})))
+            return
+        for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+            usage, started = None, False
+            try:
+                with self.limiter.slot(estimated):
+                    for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                        started = True
+                        usage = getattr(chunk.message, "usage_metadata", None) or usage
+                        yield chunk
+            except Exception as e:
+                # Only retry before anything was streamed to the caller
+                if started:
+                    raise
+                time.sleep(self._retry(e, attempt))
+                continue
+            self._settle(estimated, usage)
+            return
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = self._estimate(messages, kwargs)
+        if type(self.inner)._astream is BaseChatModel._astream and type(self.inner)._stream is BaseChatModel._stream:
+            message = (await self._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)).generations[0].message
+            yield ChatGenerationChunk(message=AIMessageChunk(**message.model_dump(exclude={"type"})))
+            return
+        for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+            usage, started = None, False
+            try:
+                async with self.limiter.aslot(estimated):
+                    async for chunk in self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                        started = True
+                        usage = getattr(chunk.message, "usage_metadata", None) or usage
+                        yield chunk
+            except Exception as e:
+                if started:
+                    raise
+                await asyncio.sleep(self._retry(e, attempt))
+                continue
+            self._settle(estimated, usage)
+            return
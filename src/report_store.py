@@ -0,0 +1,288 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+"""Compressed, indexed store of accepted research reports.
+
+Usage:
+    python -m src.report_store acme.com
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import zstandard
+
+from src.config import Config
+from src.telemetry import METRICS
+from src.utils import normalize_domain
+
+
+# Reports written per transaction, and how long the writer waits to fill a batch
+WRITE_BATCH_SIZE = 100
+WRITE_INTERVAL = 0.5
+
+
+def same_industry(stored: str, requested: str) -> bool:
+    """Whether a stored report's industry matches the requested one; a missing industry matches any.
+
+    Args:
+        stored: The industry the stored report was written for
+        requested: The industry of the company being researched now
+
+    Returns:
+        bool: True if the stored report can stand in for a new one
+    """
+    stored, requested = " ".join((stored or "").lower().split()), " ".join((requested or "").lower().split())
+    return not stored or not requested or stored == requested
+
+
+@dataclass
+class StoredReport:
+    """An accepted report and its index fields.
+
+    Attributes:
+        company_name: The name of the company
+        domain: The company's normalized domain
+        industry: The industry sector the company operates in
+        created_at: When the report was accepted (epoch seconds)
+        researched_at: When the research behind the report was done; a news-only refresh keeps
+            the original report's time, so refreshes cannot extend a report's life indefinitely
+        score: The reviewer's score, if any
+        rewritten: Whether the report went through a rewrite
+        report: The report markdown
+    """
+
+    company_name: str
+    domain: str
+    industry: str
+    created_at: float
+    researched_at: float
+    score: Optional[int]
+    rewritten: bool
+    report: str
+
+
+class ReportStore:
+    """Keeps every accepted report zstd-compressed in SQLite, indexed by company domain.
+
+    Reports are appended to a ``reports`` table, and a ``latest`` table maps each domain
+    to its newest report, so ``latest(domain)`` is a single primary-key lookup however
+    many reports are stored. Writes are queued and committed in batches by a background
+    thread, keeping them off the graph's critical path. Reports still waiting in the
+    queue are already visible to ``latest``.
+
+    Attributes:
+        path: Location of the SQLite database file
+    """
+
+    def __init__(self, path: str, queue_size: int = 1000) -> None:
+        """Open (or create) the store and start its writer thread.
+
+        Args:
+            path: Location of the SQLite database file
+            queue_size: Most reports waiting to be written before ``save`` blocks
+        """
+        self.path = path
+        self._compressor = zstandard.ZstdCompressor(level=9)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, StoredReport] = {}
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY,
+                company_name TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                industry TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                researched_at REAL,
+                score INTEGER,
+                rewritten INTEGER NOT NULL,
+                report BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS reports_domain_created_at ON reports (domain, created_at);
+            CREATE TABLE IF NOT EXISTS latest (
+                domain TEXT PRIMARY KEY,
+                report_id INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        if "researched_at" not in {row[1] for row in self._conn.execute("PRAGMA table_info(reports)")}:
+            # Stores written before refreshes kept the research time; their reports fall back to created_at
+            self._conn.execute("ALTER TABLE reports ADD COLUMN researched_at REAL")
+        self._writer = threading.Thread(target=self._write_loop, name="report-store-writer", daemon=True)
+        self._writer.start()
+
+    def save(
+        self, company_name: str, company_website: str, industry: str, report: str,
+        score: Optional[int] = None, rewritten: bool = False, researched_at: Optional[float] = None,
+    ) -> None:
+        """Queue an accepted report to be written.
+
+        Args:
+            company_name: The name of the company
+            company_website: The website URL of the company
+            industry: The industry sector the company operates in
+            report: The report markdown
+            score: The reviewer's score, if any
+            rewritten: Whether the report went through a rewrite
+            researched_at: When the research behind the report was done (defaults to now);
+                pass the stored report's time when only part of it was refreshed
+        """
+        now = time.time()
+        stored = StoredReport(
+            company_name, normalize_domain(company_website), industry or "", now, researched_at or now, score, bool(rewritten), report,
+        )
+        with self._lock:
+            self._pending[stored.domain] = stored
+        self._queue.put(stored)
+
+    def latest(self, domain: str) -> Optional[StoredReport]:
+        """Return the newest report for a domain.
+
+        Args:
+            domain: A domain or company URL; it is normalized before the lookup
+
+        Returns:
+            Optional[StoredReport]: The report, or None if the domain has none
+        """
+        domain = normalize_domain(domain)
+        with self._lock:
+            pending = self._pending.get(domain)
+            if pending is not None:
+                return pending
+            row = self._conn.execute(
+                """
+                SELECT r.company_name, r.domain, r.industry, r.created_at, COALESCE(r.researched_at, r.created_at),
+                    r.score, r.rewritten, r.report
+                FROM latest l JOIN reports r ON r.id = l.report_id WHERE l.domain = ?
+                """,
+                (domain,),
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredReport(*row[:6], bool(row[6]), self._decompressor.decompress(row[7]).decode("utf-8"))
+
+    def latest_created_at(self, domain: str, industry: Optional[str] = None) -> Optional[float]:
+        """Return when the newest report for a domain was accepted, without loading the report itself.
+
+        Args:
+            domain: A domain or company URL; it is normalized before the lookup
+            industry: If given, only count the newest report when its industry matches (see ``same_industry``)
+
+        Returns:
+            Optional[float]: Epoch seconds, or None if the domain has no (matching) report
+        """
+        domain = normalize_domain(domain)
+        with self._lock:
+            pending = self._pending.get(domain)
+            if pending is not None:
+                row = (pending.created_at, pending.industry)
+            else:
+                # The report blob is the last column of its row, so it is never read here
+                row = self._conn.execute(
+                    "SELECT r.created_at, r.industry FROM latest l JOIN reports r ON r.id = l.report_id WHERE l.domain = ?",
+                    (domain,),
+                ).fetchone()
+        if row is None or (industry is not None and not same_industry(row[1], industry)):
+            return None
+        return row[0]
+
+    def flush(self) -> None:
+        """Block until every queued report has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued reports and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch: List[StoredReport] = [self._queue.get()]
+            deadline = time.monotonic() + WRITE_INTERVAL
+            while batch[-1] is not None and len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            reports = [stored for stored in batch if stored is not None]
+            try:
+                if reports:
+                    self._write(reports)
+            except Exception as e:
+                print(f"Error writing {len(reports)} reports to {self.path}: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write(self, reports: List[StoredReport]) -> None:
+        """Write a batch of reports and point each domain at its newest one, in one transaction."""
+        rows = [(stored, self._compressor.compress(stored.report.encode("utf-8"))) for stored in reports]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for stored, blob in rows:
+                    cursor = self._conn.execute(
+                        "INSERT INTO reports (company_name, domain, industry, created_at, researched_at, score, rewritten, report) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (stored.company_name, stored.domain, stored.industry, stored.created_at, stored.researched_at, stored.score, int(stored.rewritten), blob),
+                    )
+                    self._conn.execute(
+                        "INSERT INTO latest (domain, report_id) VALUES (?, ?) ON CONFLICT (domain) DO UPDATE SET report_id = excluded.report_id",
+                        (stored.domain, cursor.lastrowid),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for stored, _ in rows:
+                # A newer report for the same domain may have been queued meanwhile
+                if self._pending.get(stored.domain) is stored:
+                    del self._pending[stored.domain]
+        METRICS.inc("research_reports_stored_total", len(rows))
+
+
+@lru_cache(maxsize=None)
+def get_report_store(path: Optional[str] = None) -> ReportStore:
+    """Return the process-wide ReportStore, opening it on first use.
+
+    Queued reports are written when the process exits.
+
+    Args:
+        path: Location of the SQLite database file (defaults to Config.REPORT_STORE_PATH)
+
+    Returns:
+        ReportStore: The shared store
+    """
+    store = ReportStore(path or Config.REPORT_STORE_PATH)
+    atexit.register(store.close)
+    return store
+
+
+if __name__ == "__main__":
+    found = get_report_store().latest(sys.argv[1])
+    if found is None:
+        print(f"No stored report for {sys.argv[1]}")
+    else:
+        print(f"# {found.company_name} ({found.domain}), {time.strftime('%Y-%m-%d %H:%M', time.localtime(found.created_at))}, score {found.score}\n")
+        print(found.report)
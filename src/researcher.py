@@ -3,11 +3,21 @@
 # Date: 2025-06-11
 # Project: ThinkBridge Assignment
 # -----------------------------------------------------
-from typing import Dict, Any
-from src.graph import agentic_graph
-from urllib.parse import urlparse
+import asyncio
+import time
+from datetime import datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple
+from src.config import Config
+from src.graph import compile_graph, get_graph
+from src.streaming import ReportStreamWriter
+from src.telemetry import create_telemetry
+from src.utils import normalize_domain
 import os
-import pandas as pd
+
+# Graph nodes whose LLM output is the report itself
+REPORT_NODES = ("researcher", "rewriter")
 
 class CompanyResearcher:
     """A class that provides an interface for conducting comprehensive company research.
@@ -15,16 +25,73 @@ class CompanyResearcher:
     This class serves as a wrapper around the graph-based research system, providing
     both synchronous and asynchronous methods for company research.
     
+    When the graph was compiled with a checkpointer, every company runs on its own thread
+    (keyed by batch id and normalized domain), so companies that finished less than
+    Config.REPORT_FRESH_DAYS ago are skipped and interrupted ones resume from their last
+    completed node.
+    
     Attributes:
         graph: The graph instance used for conducting research
+        callbacks: LangChain callback handlers attached to every graph run
     """
-    def __init__(self, graph) -> None:
+    def __init__(self, graph, callbacks: Optional[List[Any]] = None) -> None:
         """Initialize the CompanyResearcher with a graph instance.
         
         Args:
             graph: The graph instance to use for conducting research
+            callbacks: Optional LangChain callback handlers (e.g. for timing) attached to every run
         """
         self.graph = graph
+        self.callbacks = callbacks or []
+        
+    def _thread_config(self, company_website: str) -> Optional[Dict[str, Any]]:
+        """Return the checkpoint thread config for a company, or None if the graph is not checkpointed."""
+        if not self.graph.checkpointer:
+            return None
+        return {"configurable": {"thread_id": f"{Config.BATCH_ID}:{normalize_domain(company_website)}"}}
+    
+    def _run_config(self, company_website: str, **configurable: Any) -> Dict[str, Any]:
+        """Build the config for one graph run: the checkpoint thread, if any, extra configurable values and callbacks."""
+        thread = (self._thread_config(company_website) or {}).get("configurable", {})
+        return {"configurable": {**thread, **configurable}, "callbacks": self.callbacks}
+    
+    @staticmethod
+    def _inputs(company_name: str, company_website: str, industry: str) -> Dict[str, Any]:
+        """Build the graph input for a new run.
+        
+        Everything a previous run on the same checkpoint thread produced is cleared, so a
+        company researched again (once its finished run is older than REPORT_FRESH_DAYS)
+        starts from a clean slate instead of, say, carrying the old review into the prompt.
+        """
+        return {
+            "company_name": company_name, "company_website": company_website, "industry": industry,
+            "evidence": {}, "final_report": None, "llm_evaluation": None, "rewritten": False,
+            "freshness": None, "stored_report": None,
+            # None empties the accumulating channels (see graph.merge_or_reset / extend_or_reset)
+            "token_savings": None, "errors": None,
+        }
+    
+    @staticmethod
+    def _reusable(snapshot) -> bool:
+        """Check whether a checkpointed thread finished recently enough (within Config.REPORT_FRESH_DAYS) to reuse its result."""
+        if not snapshot.values or snapshot.next or not snapshot.created_at:
+            return False
+        age_days = (time.time() - datetime.fromisoformat(snapshot.created_at).timestamp()) / (24 * 3600)
+        return age_days < Config.REPORT_FRESH_DAYS
+    
+    async def is_finished(self, company_website: str) -> bool:
+        """Check whether a checkpointed run for this company has recently completed.
+        
+        Args:
+            company_website: The website URL of the company
+            
+        Returns:
+            bool: True if the company's thread ran to the end less than Config.REPORT_FRESH_DAYS ago
+        """
+        config = self._thread_config(company_website)
+        if config is None:
+            return False
+        return self._reusable(await self.graph.aget_state(config))
         
     def research_company(self, company_name: str, company_website: str, industry: str) -> Dict[str, Any]:
         """Conduct research on a company and generate a comprehensive report.
@@ -45,7 +112,7 @@ class CompanyResearcher:
         print("=" * 50)
         
         try:
-            result = self.graph.invoke({"company_name":company_name, "company_website":company_website, "industry":industry})
+            result = self.graph.invoke(self._inputs(company_name, company_website, industry), self._run_config(company_website))
             
             print("\nResearch completed!")
             print("=" * 50)
@@ -58,41 +125,263 @@ class CompanyResearcher:
             
     
 
-    async def aresearch_company(self, company_name: str, company_website: str) -> Dict[str, Any]:
-        """Asynchronous wrapper for conducting company research.
+    async def aresearch_company(
+        self,
+        company_name: str,
+        company_website: str,
+        industry: str,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        console: bool = False,
+    ) -> Dict[str, Any]:
+        """Asynchronously conduct research on a company using the graph's native async API.
         
         Args:
             company_name: The name of the company to research
             company_website: The website URL of the company
+            industry: The industry sector the company operates in
+            timeout: Optional number of seconds after which the research is cancelled
+            stream: Stream the report to a partial file as it is written (see ReportStreamWriter)
+            console: When streaming, also echo the report to stdout
             
         Returns:
             Dict[str, Any]: A dictionary containing the research results
+            
+        Raises:
+            asyncio.TimeoutError: If the research does not finish within ``timeout``
+            Exception: If an error occurs during the research process
         """
-        return self.research_company(company_name, company_website)
+        result, _ = await self._aresearch_company(company_name, company_website, industry, timeout, stream, console)
+        return result
+    
+    async def _aresearch_company(
+        self,
+        company_name: str,
+        company_website: str,
+        industry: str,
+        timeout: Optional[float],
+        stream: bool,
+        console: bool,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Run ``aresearch_company``, also reporting whether a recently finished thread was reused instead."""
+        inputs = self._inputs(company_name, company_website, industry)
+        config = self._thread_config(company_website)
+        
+        if config is not None:
+            snapshot = await self.graph.aget_state(config)
+            if self._reusable(snapshot):
+                print(f"Skipping {company_name}: already researched in batch {Config.BATCH_ID}")
+                return snapshot.values, True
+            if snapshot.next:
+                # Passing no input resumes the thread from its last checkpoint
+                print(f"Resuming research for {company_name} at {', '.join(snapshot.next)}")
+                inputs = None
+        
+        if inputs is not None:
+            print(f"Starting research for {company_name} ({company_website})")
+        
+        if stream:
+            research = self._astream_report(company_name, company_website, industry, resume=inputs is None, console=console)
+        else:
+            research = self.graph.ainvoke(inputs, self._run_config(company_website))
+        result = await asyncio.wait_for(research, timeout=timeout or None)
+        
+        print(f"Research completed for {company_name}")
+        return result, False
+    
+    async def astream_company(
+        self,
+        company_name: str,
+        company_website: str,
+        industry: str,
+        resume: bool = False,
+        save_report: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Research a company, yielding progress events while the graph runs.
+        
+        Report text is streamed token by token as the researcher and rewriter write it.
+        
+        Args:
+            company_name: The name of the company to research
+            company_website: The website URL of the company
+            industry: The industry sector the company operates in
+            resume: Continue the company's checkpointed thread instead of starting over
+            save_report: Whether the graph saves the accepted report itself
+            
+        Yields:
+            Dict[str, Any]: Events, each with a 'type' of:
+                - node: A graph node finished ('node', plus the state 'keys' it updated)
+                - report_start: A new draft of the report is being written by 'node'
+                - token: A chunk of report 'text' written by 'node'
+                - done: Research finished ('report', the reviewer's 'evaluation' and the
+                  report's 'freshness', "fresh" when a stored report was reused as is)
+        """
+        inputs = None if resume else self._inputs(company_name, company_website, industry)
+        config = self._run_config(company_website, save_report=save_report)
+        state = dict(inputs or {})
+        draft = None
+        
+        async for mode, chunk in self.graph.astream(inputs, config, stream_mode=["updates", "messages"]):
+            if mode == "updates":
+                for node, update in chunk.items():
+                    state.update(update or {})
+                    yield {"type": "node", "node": node, "keys": sorted(update or {})}
+                continue
+            
+            message, metadata = chunk
+            # Messages from the research agent filling evidence gaps carry the agent's own
+            # node name, so only the writer calls made by the report nodes themselves pass
+            node = metadata.get("langgraph_node")
+            if node not in REPORT_NODES or message.type not in ("ai", "AIMessageChunk") or not isinstance(message.content, str) or not message.content:
+                continue
+            if message.id != draft:
+                draft = message.id
+                yield {"type": "report_start", "node": node}
+            yield {"type": "token", "node": node, "text": message.content}
+        
+        if self.graph.checkpointer:
+            # The checkpoint also holds what was produced before a resumed run was interrupted
+            state = (await self.graph.aget_state(config)).values
+        yield {"type": "done", "report": state.get("final_report"), "evaluation": state.get("llm_evaluation"), "freshness": state.get("freshness")}
+    
+    async def _astream_report(self, company_name: str, company_website: str, industry: str, resume: bool, console: bool) -> Dict[str, Any]:
+        """Run the research for one company, streaming the report into a ReportStreamWriter."""
+        writer = ReportStreamWriter(company_name, console=console, save=Config.REPORT_FILES_ENABLED)
+        try:
+            async for event in self.astream_company(company_name, company_website, industry, resume=resume, save_report=False):
+                if event["type"] == "report_start":
+                    writer.start(event["node"])
+                elif event["type"] == "token":
+                    writer.write(event["text"])
+                elif event["type"] == "done":
+                    # A reused report was saved when it was first accepted; the non-streaming path does not save it again either
+                    if event.get("freshness") != "fresh":
+                        writer.finalize(event["report"])
+                    return {"company_name": company_name, "company_website": company_website, "industry": industry,
+                            "final_report": event["report"], "llm_evaluation": event["evaluation"]}
+        finally:
+            writer.close()
+    
+    async def aresearch_companies(
+        self,
+        companies: Iterable[Tuple[str, str, str]],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+        keep_results: bool = True,
+    ) -> Dict[str, Any]:
+        """Research many companies concurrently and summarise the outcome.
+        
+        At most ``concurrency`` companies are in flight at once. Companies are pulled from
+        ``companies`` (in a thread, one queue's worth at a time) into a bounded queue as workers
+        free up, so a lazy iterable (such as a ``CompanyIngest`` over a large file) is never
+        read far ahead of the research and never blocks the event loop.
+        A failure or timeout for one company is recorded in the summary and never aborts
+        the others.
+        
+        Args:
+            companies: Iterable of (company_name, company_website, industry) tuples
+            concurrency: Maximum number of companies researched at once (defaults to Config.BATCH_CONCURRENCY)
+            timeout: Per-company timeout in seconds (defaults to Config.COMPANY_TIMEOUT)
+            stream: Stream each report to a partial file as it is written; with a concurrency
+                of 1 the report is echoed to the console too
+            keep_results: Keep every company's final state in the summary; turn off for
+                large batches, where the reports are saved to disk anyway
+            
+        Returns:
+            Dict[str, Any]: A summary with the keys:
+                - total: Number of companies attempted
+                - succeeded / failed / timed_out: Outcome counts
+                - skipped: Companies recently finished in a previous run of the same batch
+                - elapsed_seconds: Wall-clock time for the whole batch
+                - results: Mapping of company name to final graph state
+                - errors: Mapping of company name to error message
+        """
+        concurrency = concurrency or Config.BATCH_CONCURRENCY
+        timeout = Config.COMPANY_TIMEOUT if timeout is None else timeout
+        queue = asyncio.Queue(maxsize=max(Config.INGEST_QUEUE_SIZE, concurrency))
+        summary = {"total": 0, "succeeded": 0, "failed": 0, "timed_out": 0, "skipped": 0, "elapsed_seconds": 0.0, "results": {}, "errors": {}}
+        
+        async def _run(company_name: str, company_website: str, industry: str) -> None:
+            try:
+                result, skipped = await self._aresearch_company(
+                    company_name, company_website, industry, timeout=timeout, stream=stream, console=stream and concurrency == 1
+                )
+                if keep_results:
+                    summary["results"][company_name] = result
+                summary["skipped" if skipped else "succeeded"] += 1
+            except asyncio.TimeoutError:
+                summary["timed_out"] += 1
+                summary["errors"][company_name] = f"Timed out after {timeout}s"
+                print(f"Research timed out for {company_name}")
+            except Exception as e:
+                summary["failed"] += 1
+                summary["errors"][company_name] = str(e)
+                print(f"Error during research for {company_name}: {str(e)}")
+        
+        async def _worker() -> None:
+            while (company := await queue.get()) is not None:
+                await _run(*company)
+        
+        iterator = iter(companies)
+        
+        def _next_batch() -> List[Tuple[str, str, str]]:
+            return list(islice(iterator, queue.maxsize))
+        
+        started = time.perf_counter()
+        workers = [asyncio.create_task(_worker()) for _ in range(concurrency)]
+        try:
+            # Reading the input can block (parsing file chunks, report store lookups for long runs
+            # of skipped rows), so it runs in a thread to keep the research going meanwhile
+            while batch := await asyncio.to_thread(_next_batch):
+                for company in batch:
+                    summary["total"] += 1
+                    await queue.put(company)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+        return summary
     
 
 
 if __name__ == "__main__":
-    import pandas as pd
-    from urllib.parse import urlparse
-
-    def fetch_company_data(path: str, count: int = 1) -> list[tuple[str, str]]:
-        def _get_company_name(raw_url: str):
-            url = raw_url.strip().split()[0]
-            parsed = urlparse(url)
-            company_name = parsed.netloc.replace("www.", "").split(".")[0]
-            return company_name.upper()
+    # Imported here so that library users of CompanyResearcher do not pay for pandas
+    from src.ingest import CompanyIngest
 
-        database = pd.read_csv(path)
-        values_list = [(_get_company_name(i[0]), i[0], i[1]) for i in database.values][:count]
-        return values_list
-
-    # Get count from env
-    count = int(os.getenv("COMPANY_COUNT", "1"))
+    async def run_batch(companies: Iterable[Tuple[str, str, str]]) -> Dict[str, Any]:
+        # Sync graph nodes run on the loop's default executor, so size it for the batch
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=Config.BATCH_CONCURRENCY * 4))
+        if not Config.CHECKPOINT_ENABLED:
+            graph = get_graph()
+            telemetry = create_telemetry(graph)
+            try:
+                return await CompanyResearcher(graph=graph, callbacks=[telemetry]).aresearch_companies(companies, stream=Config.STREAM_REPORTS, keep_results=False)
+            finally:
+                telemetry.close()
+        
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        
+        os.makedirs(os.path.dirname(Config.CHECKPOINT_PATH) or ".", exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(Config.CHECKPOINT_PATH) as checkpointer:
+            graph = compile_graph(checkpointer=checkpointer)
+            telemetry = create_telemetry(graph)
+            try:
+                return await CompanyResearcher(graph=graph, callbacks=[telemetry]).aresearch_companies(companies, stream=Config.STREAM_REPORTS, keep_results=False)
+            finally:
+                telemetry.close()
 
-    database = fetch_company_data(path=os.path.join(os.getcwd(), "companies.csv"), count=count)
-    researcher = CompanyResearcher(graph=agentic_graph)
+    ingest = CompanyIngest(Config.COMPANIES_PATH)
+    summary = asyncio.run(run_batch(islice(ingest, Config.COMPANY_COUNT or None)))
+    print(ingest.summary())
 
-    for row in database:
-        researcher.research_company(row[0], row[1], row[2])
-    
\ No newline at end of file
+    print("=" * 50)
+    print(f"Batch finished in {summary['elapsed_seconds']}s: {summary['succeeded']}/{summary['total']} succeeded, "
+          f"{summary['failed']} failed, {summary['timed_out']} timed out, {summary['skipped']} already done")
+    for company_name, error in summary["errors"].items():
+        print(f" - {company_name}: {error}")
+    if Config.TELEMETRY_ENABLED:
+        print(f"Timing and token telemetry written to {Config.TELEMETRY_PATH}")
\ No newline at end of file
@@ -0,0 +1,340 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+"""Long-running HTTP service that queues research jobs and streams their progress.
+
+Jobs are queued and run by a bounded pool of async workers over the research graph.
+Progress (finished nodes and the report as it is written) is streamed to clients as
+server-sent events. A job submitted for a company that is already queued or running
+joins the in-flight job instead of starting another one.
+
+Usage:
+    python -m src.service
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.config import Config
+from src.graph import get_graph
+from src.researcher import CompanyResearcher
+from src.telemetry import METRICS, create_telemetry
+from src.utils import normalize_domain
+
+
+# Events after which a job's event stream ends
+TERMINAL_EVENTS = ("done", "error")
+# Events that only carry report text as it is written; the final report is on the done event
+STREAMED_EVENTS = ("report_start", "token")
+
+
+class JobRequest(BaseModel):
+    company_name: str
+    company_website: str
+    industry: str
+
+
+@dataclass
+class Job:
+    """A research job and the events it has produced so far.
+
+    Attributes:
+        id: Job identifier
+        company_name: The name of the company to research
+        company_website: The website URL of the company
+        industry: The industry sector the company operates in
+        domain: Normalized company domain, used to join duplicate submissions
+        status: One of queued, running, succeeded or failed
+        report: The final report, once the job succeeded
+        evaluation: The reviewer's last evaluation
+        error: The error message, once the job failed
+        events: The events published so far, replayed to late subscribers; once the job
+            finishes, the streamed report text is dropped in favour of the final report
+    """
+
+    id: str
+    company_name: str
+    company_website: str
+    industry: str
+    domain: str
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    report: Optional[str] = None
+    evaluation: Optional[dict] = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record an event and hand it to every live subscriber."""
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def compact(self) -> None:
+        """Drop the streamed report text from the event history of a finished job.
+
+        Late subscribers still get every status and node event, and the final report on the
+        done event, without the job keeping thousands of token events for its whole history.
+        """
+        self.events = [event for event in self.events if event["type"] not in STREAMED_EVENTS]
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every event of the job: the ones published so far, then new ones until it finishes."""
+        queue = asyncio.Queue()
+        # Nothing awaits between copying the history and subscribing, so no event is missed or repeated
+        history = list(self.events)
+        self._subscribers.add(queue)
+        try:
+            for event in history:
+                yield event
+            if self.finished:
+                return
+            while True:
+                event = await queue.get()
+                yield event
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+    def to_dict(self, include_report: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "company_name": self.company_name,
+            "company_website": self.company_website,
+            "industry": self.industry,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_report:
+            data.update(report=self.report, evaluation=self.evaluation)
+        return data
+
+
+class JobManager:
+    """Queues research jobs and runs them on a bounded pool of async workers.
+
+    Attributes:
+        researcher: The CompanyResearcher the jobs run on
+        workers: Number of jobs researched at once
+        history: Number of finished jobs kept for status queries
+    """
+
+    def __init__(self, researcher: CompanyResearcher, workers: int, queue_size: int, history: int) -> None:
+        """Initialize the manager.
+
+        Args:
+            researcher: The CompanyResearcher the jobs run on
+            workers: Number of jobs researched at once
+            queue_size: Most jobs waiting for a worker before submissions are rejected
+            history: Number of finished jobs kept for status queries
+        """
+        self.researcher = researcher
+        self.workers = workers
+        self.history = history
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._in_flight: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        self._tasks = [asyncio.create_task(self._worker(), name=f"research-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks and wait for them to exit."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, company_name: str, company_website: str, industry: str) -> Tuple[Job, bool]:
+        """Queue a research job, or join the in-flight job for the same company.
+
+        Args:
+            company_name: The name of the company to research
+            company_website: The website URL of the company
+            industry: The industry sector the company operates in
+
+        Returns:
+            Tuple[Job, bool]: The job, and whether it was newly created
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+        """
+        domain = normalize_domain(company_website)
+        job = self._in_flight.get(domain)
+        if job is not None:
+            METRICS.inc("research_jobs_submitted_total", result="joined")
+            return job, False
+
+        job = Job(uuid.uuid4().hex, company_name, company_website, industry, domain)
+        self._queue.put_nowait(job)
+        self._in_flight[domain] = job
+        self.jobs[job.id] = job
+        job.publish({"type": "status", "status": job.status})
+        METRICS.inc("research_jobs_submitted_total", result="created")
+        self._update_gauges()
+        self._trim()
+        return job, True
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "queued": self._queue.qsize(), "running": self._running, "jobs": len(self.jobs)}
+
+    def _update_gauges(self) -> None:
+        METRICS.set("research_jobs_queued", self._queue.qsize())
+        METRICS.set("research_jobs_running", self._running)
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            self._update_gauges()
+            try:
+                await self._run(job)
+            finally:
+                self._running -= 1
+                self._in_flight.pop(job.domain, None)
+                self._update_gauges()
+                self._trim()
+
+    async def _run(self, job: Job) -> None:
+        """Research one job, publishing its progress events."""
+        job.status, job.started_at = "running", time.time()
+        job.publish({"type": "status", "status": job.status})
+        print(f"Starting research job {job.id} for {job.company_name} ({job.company_website})")
+
+        try:
+            async with asyncio.timeout(Config.COMPANY_TIMEOUT or None):
+                async for event in self.researcher.astream_company(job.company_name, job.company_website, job.industry):
+                    if event["type"] == "done":
+                        job.report, job.evaluation = event["report"], event["evaluation"]
+                        job.status, job.finished_at = "succeeded", time.time()
+                    job.publish(event)
+        except TimeoutError:
+            job.error = f"Timed out after {Config.COMPANY_TIMEOUT}s"
+        except Exception as e:
+            job.error = str(e)
+
+        if job.error is not None:
+            job.status, job.finished_at = "failed", time.time()
+            job.publish({"type": "error", "error": job.error})
+            print(f"Research job {job.id} for {job.company_name} failed: {job.error}")
+        else:
+            print(f"Research job {job.id} for {job.company_name} finished")
+        job.compact()
+        METRICS.inc("research_jobs_finished_total", status=job.status)
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Format an event as a server-sent event."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def create_app(workers: Optional[int] = None) -> FastAPI:
+    """Build the job service application.
+
+    Args:
+        workers: Number of jobs researched at once (defaults to Config.SERVICE_WORKERS)
+
+    Returns:
+        FastAPI: The application
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        workers_count = workers or Config.SERVICE_WORKERS
+        # Sync graph nodes run on the loop's default executor, so size it for the worker pool
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=workers_count * 4))
+        graph = get_graph()
+        telemetry = create_telemetry(graph, serve_metrics=False)
+        manager = JobManager(CompanyResearcher(graph=graph, callbacks=[telemetry]), workers_count, Config.SERVICE_QUEUE_SIZE, Config.SERVICE_JOB_HISTORY)
+        await manager.start()
+        app.state.jobs = manager
+        try:
+            yield
+        finally:
+            await manager.stop()
+            telemetry.close()
+
+    app = FastAPI(title="Company Researcher", lifespan=lifespan)
+
+    def _job(request: Request, job_id: str) -> Job:
+        job = request.app.state.jobs.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(body: JobRequest, request: Request):
+        """Queue a research job, or join the one already running for the same company."""
+        try:
+            job, created = request.app.state.jobs.submit(body.company_name, body.company_website, body.industry)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="The job queue is full, try again later")
+        return {**job.to_dict(include_report=False), "joined": not created, "events_url": f"/jobs/{job.id}/events"}
+
+    @app.get("/jobs")
+    async def list_jobs(request: Request):
+        """List the known jobs, most recent first, without their reports."""
+        return [job.to_dict(include_report=False) for job in reversed(request.app.state.jobs.jobs.values())]
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str, request: Request):
+        """Return a job's status, and its report once it has finished."""
+        return _job(request, job_id).to_dict()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, request: Request):
+        """Stream a job's progress and report as server-sent events, starting from its first event."""
+        job = _job(request, job_id)
+
+        async def _stream():
+            async for event in job.subscribe():
+                yield _sse(event)
+
+        return StreamingResponse(_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/health")
+    async def health(request: Request):
+        return {"status": "ok", **request.app.state.jobs.stats()}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(create_app(), host=Config.SERVICE_HOST, port=Config.SERVICE_PORT)
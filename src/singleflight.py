@@ -0,0 +1,91 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+from src.telemetry import METRICS
+
+
+_lock = threading.Lock()
+_calls: Dict[str, Future] = {}
+# Async calls are coalesced per event loop, since their tasks belong to it
+_async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+
+def _key(func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    # Arguments are compared exactly: URLs whose path or query differ only in case are different pages
+    return f"{func.__qualname__}:{json.dumps(bound.arguments, sort_keys=True, default=repr)}"
+
+
+def coalesce(func: Callable) -> Callable:
+    """Decorator that lets identical concurrent calls share one execution.
+
+    While a call is in flight, any other call with exactly the same arguments waits for
+    it and gets the same result or exception instead of repeating the upstream request. Nothing is kept once the call finishes;
+    that is the job of the persistent caches.
+
+    Works on plain and ``async`` functions. Async calls are run as a separate task, so a
+    caller that is cancelled (for example by a company timeout) does not cancel the call
+    for the others.
+
+    Args:
+        func: The function to wrap
+
+    Returns:
+        Callable: The coalescing wrapper
+    """
+    signature = inspect.signature(func)
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _key(func, signature, args, kwargs)
+            calls = _async_calls.setdefault(asyncio.get_running_loop(), {})
+            task = calls.get(key)
+            if task is None:
+                task = calls[key] = asyncio.ensure_future(func(*args, **kwargs))
+                task.add_done_callback(lambda _: calls.pop(key, None))
+                METRICS.inc("research_coalesced_calls_total", function=name, role="leader")
+            else:
+                METRICS.inc("research_coalesced_calls_total", function=name, role="follower")
+            return await asyncio.shield(task)
+
+        return _async_wrapper
+
+    @functools.wraps(func)
+    def _wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = _key(func, signature, args, kwargs)
+        with _lock:
+            future = _calls.get(key)
+            leader = future is None
+            if leader:
+                future = _calls[key] = Future()
+        METRICS.inc("research_coalesced_calls_total", function=name, role="leader" if leader else "follower")
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _lock:
+                _calls.pop(key, None)
+
+    return _wrapper
@@ -0,0 +1,108 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import os
+from typing import Optional
+
+from src.agent_with_tools import report_filename, report_header
+
+
+class ReportStreamWriter:
+    """Writes a report to disk (and optionally the console) while it is being generated.
+
+    Tokens are appended to a ``.partial.md`` file next to where the report will be saved.
+    Every new draft (the researcher's, then the rewriter's) starts the partial file over.
+    Once the reviewer accepts the report, the partial file is renamed to the final report
+    file. A failed run leaves the partial file behind for inspection. With ``save`` off
+    nothing is written to disk and the report is only echoed to the console, if at all.
+
+    Attributes:
+        company_name: The name of the company being researched
+        console: Whether tokens are echoed to stdout as they arrive
+        save: Whether the report is written to disk
+        path: The final report filename
+        partial_path: The file the report is streamed into
+    """
+
+    def __init__(self, company_name: str, console: bool = False, save: bool = True) -> None:
+        """Initialize the writer.
+
+        Args:
+            company_name: The name of the company being researched
+            console: Whether tokens are echoed to stdout as they arrive
+            save: Whether the report is written to disk
+        """
+        self.company_name = company_name
+        self.console = console
+        self.save = save
+        self.path = report_filename(company_name)
+        self.partial_path = self.path[:-len(".md")] + ".partial.md"
+        self._file = None
+        self._chunks = []
+        self._started = False
+
+    def start(self, node: str) -> None:
+        """Start a new draft, discarding whatever the previous one streamed.
+
+        Args:
+            node: The graph node writing the draft
+        """
+        self.close()
+        self._chunks = []
+        self._started = True
+        if self.save:
+            self._file = open(self.partial_path, "w", encoding="utf-8")
+            self._file.write(report_header(self.company_name))
+            self._file.flush()
+        if self.console:
+            print(f"\n{'-' * 20} {node.upper()} IS WRITING THE REPORT FOR {self.company_name} {'-' * 20}\n", flush=True)
+
+    def write(self, text: str) -> None:
+        """Append a chunk of report text.
+
+        Args:
+            text: The streamed text
+        """
+        if not self._started:
+            self.start("report")
+        self._chunks.append(text)
+        if self._file is not None:
+            self._file.write(text)
+            self._file.flush()
+        if self.console:
+            print(text, end="", flush=True)
+
+    def finalize(self, report: Optional[str]) -> Optional[str]:
+        """Turn the partial file into the final report once it has been accepted.
+
+        Args:
+            report: The accepted report; it replaces the streamed text if the two differ
+
+        Returns:
+            Optional[str]: The final report filename, or None if there was no report or saving is off
+        """
+        self.close()
+        if not self.save:
+            if self.console and self._started:
+                print()
+            return None
+        if not report or not report.strip():
+            print(f"Error: No report content to save for {self.company_name}")
+            return None
+        if report != "".join(self._chunks):
+            with open(self.partial_path, "w", encoding="utf-8") as f:
+                f.write(report_header(self.company_name))
+                f.write(report)
+        os.replace(self.partial_path, self.path)
+        if self.console:
+            print()
+        print(f"Report successfully saved to: {self.path}")
+        return self.path
+
+    def close(self) -> None:
+        """Close the partial file, leaving it on disk."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
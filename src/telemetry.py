@@ -0,0 +1,381 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+"""Structured timing, token and cache telemetry for research runs.
+
+``Telemetry`` is a LangChain callback handler: attach it to a graph run and it records
+how long every graph node, router and tool took, the prompt/completion tokens of every
+LLM call, and a per-company summary. Events are appended to a JSONL file and aggregated
+into process-wide ``METRICS``, which ``start_metrics_server`` exposes in the Prometheus
+text format.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import Config
+
+
+# Histogram bucket upper bounds in seconds; LLM calls and whole companies run for minutes
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, tuple], float] = {}
+        self._gauges: Dict[Tuple[str, tuple], float] = {}
+        self._histograms: Dict[Tuple[str, tuple], list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add ``value`` to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to ``value``."""
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one sample (in seconds) in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # One count per bucket, then the +Inf count and the running sum
+                histogram = self._histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+            histogram[bisect.bisect_left(BUCKETS, value)] += 1
+            histogram[-1] += value
+
+    def value(self, name: str, **labels: str) -> float:
+        """Return the current value of a counter (0 if it was never incremented)."""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({name for name, _ in series}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines.extend(f"{name}{_labels(labels)} {value:g}" for (metric, labels), value in sorted(series.items()) if metric == name)
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + ("+Inf",), histogram[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram[-1]:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    """Format a sorted label tuple as ``{a="x",b="y"}``."""
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+METRICS = Metrics()
+
+
+def record_cache(namespace: str, hit: bool) -> None:
+    """Count one cache lookup for ``namespace`` as a hit or a miss.
+
+    Args:
+        namespace: The cache namespace (a search tool or ``pages``)
+        hit: Whether the lookup was served from the cache
+    """
+    METRICS.inc("research_cache_requests_total", namespace=namespace, result="hit" if hit else "miss")
+
+
+@dataclass
+class _Run:
+    """A callback run that is still in progress."""
+
+    kind: str
+    name: Optional[str]
+    root: Any
+    node: Optional[str]
+    started: float = field(default_factory=time.perf_counter)
+
+
+class RunTracker(BaseCallbackHandler):
+    """Callback handler base that times graph runs, nodes, tools and LLM calls.
+
+    Every run is attributed to the top-level graph run it belongs to and to the graph
+    node it executed in. The direct children of a top-level run are its nodes; chains
+    named in ``routers`` (conditional-edge functions such as ``to_rewrite``, which
+    LangGraph runs inside the source node) are timed as nodes too. Subclasses receive
+    each finished run through ``record``.
+
+    Attributes:
+        routers: Names of conditional-edge functions timed as nodes
+    """
+
+    run_inline = True
+
+    def __init__(self, routers: Iterable[str] = ()) -> None:
+        """Initialize the tracker.
+
+        Args:
+            routers: Names of conditional-edge functions to time as nodes
+        """
+        self.routers = set(routers)
+        self._runs: Dict[Any, _Run] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, run: _Run, seconds: float, error: Optional[BaseException], output: Any) -> None:
+        """Handle one finished run. Called with the tracker's lock held.
+
+        Args:
+            kind: ``graph``, ``node``, ``tool`` or ``llm``
+            run: The finished run
+            seconds: Wall-clock duration of the run
+            error: The exception the run failed with, if any
+            output: The run's output (an ``LLMResult`` for LLM runs)
+        """
+
+    def start_graph(self, run_id: Any, inputs: Any, metadata: Optional[dict]) -> None:
+        """Hook called when a top-level graph run starts. Called with the tracker's lock held."""
+
+    def _start(self, kind: str, name: Optional[str], run_id: Any, parent_run_id: Any) -> None:
+        parent = self._runs.get(parent_run_id)
+        if parent is None:
+            return
+        if kind == "chain" and (parent.kind == "graph" or name in self.routers):
+            kind = "node"
+        self._runs[run_id] = _Run(kind, name, parent.root, name if kind == "node" else parent.node)
+
+    def _finish(self, run_id: Any, error: Optional[BaseException] = None, output: Any = None) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is not None and run.kind != "chain":
+                self.record(run.kind, run, time.perf_counter() - run.started, error, output)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (metadata or {}).get("langgraph_node")
+        with self._lock:
+            if parent_run_id is None:
+                self._runs[run_id] = _Run("graph", name, run_id, None)
+                self.start_graph(run_id, inputs, metadata)
+            else:
+                self._start("chain", name, run_id, parent_run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            self._start("tool", (serialized or {}).get("name") or kwargs.get("name"), run_id, parent_run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        with self._lock:
+            self._start("llm", (metadata or {}).get("ls_model_name") or kwargs.get("name"), run_id, parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        with self._lock:
+            self._start("llm", (metadata or {}).get("ls_model_name") or kwargs.get("name"), run_id, parent_run_id)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id, output=outputs)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id, output=output)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, output=response)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+
+def _token_usage(response: Any) -> Tuple[int, int]:
+    """Return the (prompt, completion) token counts reported for an ``LLMResult``."""
+    prompt = completion = 0
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+    if not prompt and not completion:
+        # Older integrations only report usage in llm_output
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        prompt, completion = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return prompt, completion
+
+
+class Telemetry(RunTracker):
+    """Callback handler that writes research telemetry to a JSONL file and ``METRICS``.
+
+    One JSONL event is written per node, router, tool and LLM call, and one ``company``
+    event per graph run with its total duration, time per node, token counts and number
+    of rewrites.
+
+    Attributes:
+        path: JSONL file the events are appended to, or None to only update ``METRICS``
+    """
+
+    def __init__(self, path: Optional[str] = None, routers: Iterable[str] = ()) -> None:
+        """Initialize the handler.
+
+        Args:
+            path: JSONL file to append events to, or None to disable the file sink
+            routers: Names of conditional-edge functions to time as nodes
+        """
+        super().__init__(routers)
+        self.path = path
+        self._companies: Dict[Any, dict] = {}
+        self._file = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        """Flush and close the JSONL file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _emit(self, event: dict) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(event, default=str) + "\n")
+
+    def start_graph(self, run_id, inputs, metadata):
+        company = inputs.get("company_name") if isinstance(inputs, dict) else None
+        self._companies[run_id] = {
+            # A resumed run has no inputs, so fall back to its checkpoint thread
+            "company": company or (metadata or {}).get("thread_id"),
+            "nodes": {},
+            "tool_calls": 0,
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "rewrites": 0,
+        }
+
+    def record(self, kind, run, seconds, error, output):
+        company = self._companies.get(run.root)
+        if company is None:
+            return
+        status = "error" if error is not None else "ok"
+        event = {"ts": round(time.time(), 3), "event": "company" if kind == "graph" else kind, "company": company["company"], "seconds": round(seconds, 4), "status": status}
+
+        if kind == "graph":
+            del self._companies[run.root]
+            event.update({name: company[name] for name in ("nodes", "tool_calls", "llm_calls", "prompt_tokens", "completion_tokens", "rewrites")})
+            METRICS.observe("research_company_seconds", seconds)
+            METRICS.inc("research_companies_total", status=status)
+            METRICS.inc("research_rewrites_total", company["rewrites"])
+            finished = METRICS.value("research_companies_total", status="ok") + METRICS.value("research_companies_total", status="error")
+            METRICS.set("research_rewrite_rate", METRICS.value("research_rewrites_total") / finished)
+        elif kind == "node":
+            event["node"] = run.name
+            company["nodes"][run.name] = round(company["nodes"].get(run.name, 0) + seconds, 4)
+            if run.name == "rewriter" and error is None:
+                company["rewrites"] += 1
+            METRICS.observe("research_node_seconds", seconds, node=run.name)
+        elif kind == "tool":
+            event.update(tool=run.name, node=run.node)
+            company["tool_calls"] += 1
+            METRICS.observe("research_tool_seconds", seconds, tool=run.name)
+            METRICS.inc("research_tool_calls_total", tool=run.name, status=status)
+        elif kind == "llm":
+            prompt, completion = _token_usage(output)
+            event.update(model=run.name, node=run.node, prompt_tokens=prompt, completion_tokens=completion)
+            company["llm_calls"] += 1
+            company["prompt_tokens"] += prompt
+            company["completion_tokens"] += completion
+            METRICS.observe("research_llm_seconds", seconds, node=str(run.node))
+            METRICS.inc("research_llm_tokens_total", prompt, node=str(run.node), type="prompt")
+            METRICS.inc("research_llm_tokens_total", completion, node=str(run.node), type="completion")
+
+        if error is not None:
+            event["error"] = f"{type(error).__name__}: {error}"
+        self._emit(event)
+        if kind == "graph" and self._file is not None:
+            self._file.flush()
+
+
+def graph_routers(graph: Any) -> Iterable[str]:
+    """Return the names of a compiled graph's conditional-edge functions."""
+    return [name for branches in graph.builder.branches.values() for name in branches]
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves ``METRICS`` on ``/metrics``."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@lru_cache(maxsize=None)
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a background thread, once per address.
+
+    Args:
+        host: Interface to bind
+        port: Port to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def create_telemetry(graph: Any, serve_metrics: bool = True) -> Telemetry:
+    """Build the telemetry handler for ``graph`` from Config, starting the metrics server if enabled.
+
+    Args:
+        graph: The compiled research graph the handler will be attached to
+        serve_metrics: Whether to start the standalone metrics server when METRICS_ENABLED is set
+            (the job service serves ``/metrics`` itself)
+
+    Returns:
+        Telemetry: The callback handler
+    """
+    if serve_metrics and Config.METRICS_ENABLED:
+        start_metrics_server(Config.METRICS_HOST, Config.METRICS_PORT)
+    return Telemetry(Config.TELEMETRY_PATH if Config.TELEMETRY_ENABLED else None, routers=graph_routers(graph))
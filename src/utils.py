@@ -0,0 +1,100 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+
+def normalize_domain(raw_url: str) -> str:
+    """Reduce a company URL to a canonical, lower-case domain.
+    
+    ``https://www.Acme.com/about``, ``acme.com`` and ``http://acme.com:443/`` all map
+    to ``acme.com``, so the result can be used to key per-company state.
+    
+    Args:
+        raw_url: The company website as entered by a user or read from a sheet
+        
+    Returns:
+        str: The normalized domain, or an empty string if none can be found
+    """
+    url = raw_url.strip().split()[0] if raw_url and raw_url.strip() else ""
+    if "://" not in url:
+        url = f"http://{url}"
+    host = (urlparse(url).hostname or "").lower().rstrip(".")
+    return host.removeprefix("www.")
+
+
+class KeyedLeases:
+    """Per-key objects (such as per-host semaphores) that only exist while they are in use.
+    
+    ``lease(key)`` hands out the key's object, creating it on first use, and counts its
+    users, including callers still waiting on it. When the last one leaves, the object is
+    dropped, so a batch touching hundreds of thousands of hosts does not keep one object
+    per host alive. Objects that carry timing state (such as a politeness delay) can
+    linger while idle until ``expires_at(obj)`` has passed; expired idle objects are swept
+    on later leases.
+    
+    Attributes:
+        factory: Creates the object for a new key
+        expires_at: Optional function giving the time.monotonic() time until which an idle object is kept
+    """
+    
+    def __init__(self, factory: Callable[[], Any], expires_at: Optional[Callable[[Any], float]] = None) -> None:
+        """Initialize the registry.
+        
+        Args:
+            factory: Creates the object for a new key
+            expires_at: Optional function giving the time.monotonic() time until which an idle object is kept
+        """
+        self.factory = factory
+        self.expires_at = expires_at
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, List[Any]] = {}
+        # Idle entries waiting to expire, roughly oldest first
+        self._idle: "OrderedDict[Hashable, float]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _sweep(self, now: float) -> None:
+        while self._idle:
+            key, expires = next(iter(self._idle.items()))
+            if expires > now:
+                return
+            del self._idle[key]
+            del self._entries[key]
+    
+    @contextmanager
+    def lease(self, key: Hashable) -> Iterator[Any]:
+        """Use the object for ``key`` for the duration of the block.
+        
+        Args:
+            key: The key, for example a host name
+            
+        Yields:
+            Any: The key's object
+        """
+        with self._lock:
+            self._sweep(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [self.factory(), 0]
+            self._idle.pop(key, None)
+            entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    expires = self.expires_at(entry[0]) if self.expires_at is not None else 0.0
+                    if expires > time.monotonic():
+                        self._idle[key] = expires
+                    else:
+                        del self._entries[key]
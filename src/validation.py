@@ -0,0 +1,165 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import Config
+
+
+# Sections of the detailed report, in the order the researcher prompt asks for them
+REQUIRED_SECTIONS = (
+    "Executive Summary",
+    "Company Profile",
+    "Business Model & Offerings",
+    "Financial Health & Performance",
+    "Recent Developments & News",
+    "Competitive Landscape",
+    "Sales Intelligence & Insights",
+    "Discovery Call Preparation",
+)
+FACT_SHEET_HEADING = "Executive Fact Sheet"
+# The section a news-delta refresh rewrites
+NEWS_SECTION = "Recent Developments & News"
+LINK_PATTERN = re.compile(r"https?://[^\s)\]>\"'`]+")
+WORD_PATTERN = re.compile(r"\w+(?:['’-]\w+)*")
+# Leading markdown heading, bold or list/numbering markers, and trailing emphasis or colons
+_HEADING_PREFIX = re.compile(r"^[\s#>*_\-\d.)]+")
+_HEADING_SUFFIX = re.compile(r"[\s*_:]+$")
+
+
+def _normalize_heading(text: str) -> str:
+    text = _HEADING_SUFFIX.sub("", _HEADING_PREFIX.sub("", text)).lower()
+    return " ".join(text.replace(" and ", " & ").split())
+
+
+def _is_heading(line: str) -> bool:
+    """Whether a line can be a heading: short or marked up, so a section name mid-paragraph does not count."""
+    return bool(line.strip()) and (len(line) <= 120 or line.lstrip().startswith(("#", "*", "-")))
+
+
+def _section_span(lines: List[str], section: str) -> Optional[Tuple[int, int]]:
+    """Return the index of a section's heading line and of the first line after its body."""
+    name = _normalize_heading(section)
+    others = [_normalize_heading(other) for other in (FACT_SHEET_HEADING, *REQUIRED_SECTIONS) if other != section]
+    start = next((i for i, line in enumerate(lines) if _is_heading(line) and _normalize_heading(line).startswith(name)), None)
+    if start is None:
+        return None
+    for end in range(start + 1, len(lines)):
+        if _is_heading(lines[end]) and any(_normalize_heading(lines[end]).startswith(other) for other in others):
+            return start, end
+    return start, len(lines)
+
+
+def section_text(report: str, section: str) -> Optional[str]:
+    """Return the body of a report section, without its heading.
+    
+    Args:
+        report: The report markdown
+        section: One of REQUIRED_SECTIONS
+        
+    Returns:
+        Optional[str]: The section body, or None if the report has no such heading
+    """
+    lines = (report or "").splitlines()
+    span = _section_span(lines, section)
+    if span is None:
+        return None
+    return "\n".join(lines[span[0] + 1:span[1]]).strip()
+
+
+def replace_section(report: str, section: str, body: str) -> Optional[str]:
+    """Replace the body of a report section, keeping its heading and every other section.
+    
+    Args:
+        report: The report markdown
+        section: One of REQUIRED_SECTIONS
+        body: The new section body, without a heading
+        
+    Returns:
+        Optional[str]: The updated report, or None if the report has no such heading
+    """
+    lines = (report or "").splitlines()
+    span = _section_span(lines, section)
+    if span is None:
+        return None
+    start, end = span
+    return "\n".join(lines[:start + 1] + ["", body.strip(), ""] + lines[end:])
+
+
+def check_report(report: str) -> Dict[str, Any]:
+    """Run the structural checks on a report.
+
+    Args:
+        report: The report markdown
+
+    Returns:
+        Dict[str, Any]: The findings:
+            - words: Number of words
+            - links: Number of distinct source links
+            - fact_sheet: Whether the executive fact sheet is present
+            - missing_sections: Required report sections without a heading
+    """
+    report = report or ""
+    headings = [_normalize_heading(line) for line in report.splitlines() if _is_heading(line)]
+
+    def _has_heading(name: str) -> bool:
+        name = _normalize_heading(name)
+        return any(heading.startswith(name) for heading in headings)
+
+    return {
+        "words": len(WORD_PATTERN.findall(report)),
+        "links": len(set(LINK_PATTERN.findall(report))),
+        "fact_sheet": _has_heading(FACT_SHEET_HEADING),
+        "missing_sections": [section for section in REQUIRED_SECTIONS if not _has_heading(section)],
+    }
+
+
+def prescreen(findings: Dict[str, Any]) -> Optional[str]:
+    """Decide from the structural findings whether a report clearly passes or clearly fails.
+
+    Args:
+        findings: The output of ``check_report``
+
+    Returns:
+        Optional[str]: "pass", "fail", or None when the report needs an LLM review
+    """
+    if (
+        not findings["fact_sheet"]
+        or findings["links"] == 0
+        or findings["words"] < Config.REVIEW_FAIL_BELOW_WORDS
+        or len(findings["missing_sections"]) >= Config.REVIEW_FAIL_MISSING_SECTIONS
+    ):
+        return "fail"
+    if (
+        not findings["missing_sections"]
+        and findings["links"] >= Config.REVIEW_PASS_MIN_LINKS
+        and findings["words"] >= Config.REVIEW_PASS_MIN_WORDS
+    ):
+        return "pass"
+    return None
+
+
+def describe_findings(findings: Dict[str, Any]) -> str:
+    """Summarise the structural findings as review feedback for the researcher or rewriter.
+
+    Args:
+        findings: The output of ``check_report``
+
+    Returns:
+        str: One sentence per finding
+    """
+    problems = []
+    if not findings["fact_sheet"]:
+        problems.append("The EXECUTIVE FACT SHEET is missing.")
+    if findings["missing_sections"]:
+        problems.append(f"Missing report sections: {', '.join(findings['missing_sections'])}.")
+    if findings["links"] < Config.REVIEW_PASS_MIN_LINKS:
+        problems.append(f"Only {findings['links']} source links; cite at least {Config.REVIEW_PASS_MIN_LINKS}.")
+    if findings["words"] < Config.REVIEW_PASS_MIN_WORDS:
+        problems.append(f"Only {findings['words']} words; the report should have at least {Config.REVIEW_PASS_MIN_WORDS}.")
+    if not problems:
+        return f"All required sections and the fact sheet are present, with {findings['links']} source links and {findings['words']} words."
+    return " ".join(problems)
@@ -0,0 +1,57 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+from typing import List
+
+import pytest
+
+from benchmarks.fake_server import FakeServices
+from src.config import Config
+from src.fake_llm import ScriptedChatModel
+from src.report_store import get_report_store
+
+
+class RecordingChatModel(ScriptedChatModel):
+    """The scripted model, keeping every prompt it was sent."""
+
+    prompts: List[str] = []
+
+    def _respond(self, messages, tools):
+        self.prompts.append("\n".join(str(message.content) for message in messages))
+        return super()._respond(messages, tools)
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Run the graph against the local fake SerpAPI and websites and a recording scripted model.
+
+    The working directory and every store and cache live under ``tmp_path``, and report
+    reuse is off unless a test turns it on.
+
+    Yields:
+        Tuple[FakeServices, RecordingChatModel]: The fake services and the model
+    """
+    monkeypatch.chdir(tmp_path)
+    model = RecordingChatModel()
+    settings = {
+        "_llm_override": model,
+        "SERP_API_KEY": "test",
+        "SERP_CACHE_ENABLED": False,
+        "CRAWL_CACHE_ENABLED": False,
+        "LLM_CACHE_ENABLED": False,
+        "RATE_LIMIT_ENABLED": False,
+        "CRAWL_DOMAIN_DELAY": 0.0,
+        "REPORT_FRESH_DAYS": 0.0,
+        "REPORT_REFRESH_DAYS": 0.0,
+        "REPORT_STORE_PATH": str(tmp_path / "reports.sqlite3"),
+    }
+    for name, value in settings.items():
+        monkeypatch.setattr(Config, name, value)
+    get_report_store.cache_clear()
+    with FakeServices(page_paragraphs=20) as services:
+        monkeypatch.setattr(Config, "SERP_API_URL", f"{services.base_url}/search")
+        yield services, model
+    get_report_store().close()
+    get_report_store.cache_clear()
@@ -0,0 +1,42 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import httpx
+
+from benchmarks.fake_server import FakeServices
+from benchmarks.run import compare, percentile, summarize
+
+
+def level(concurrency: int, per_minute: float, researcher_p95: float) -> dict:
+    return {"concurrency": concurrency, "companies_per_minute": per_minute, "nodes": {"researcher": {"p95": researcher_p95}}}
+
+
+def test_percentiles_use_the_nearest_rank():
+    values = [5.0, 1.0, 3.0, 2.0, 4.0]
+    assert (percentile(values, 0), percentile(values, 50), percentile(values, 95), percentile(values, 100)) == (1.0, 3.0, 5.0, 5.0)
+    assert percentile([], 95) == 0.0
+    assert summarize({"tool": [0.1, 0.3, 0.2]}) == {"tool": {"count": 3, "p50": 0.2, "p95": 0.3, "max": 0.3}}
+
+
+def test_compare_flags_throughput_and_latency_regressions():
+    baseline = {"levels": [level(1, 100, 1.0), level(8, 400, 2.0)]}
+    current = {"levels": [level(1, 95, 1.05), level(8, 300, 3.0), level(16, 10, 9.0)]}
+    assert compare(current, baseline, max_regression=0.1) == [
+        "c=8: companies/min 400 -> 300",
+        "c=8: researcher p95 2.0s -> 3.0s",
+    ]
+    assert compare(current, baseline, max_regression=0.6) == []
+
+
+def test_fake_services_serve_search_and_sites_and_inject_failures():
+    with FakeServices(page_paragraphs=3) as services:
+        search = httpx.get(f"{services.base_url}/search", params={"q": "Acme news", "engine": "google_news"})
+        assert search.status_code == 200 and search.json()
+        page = httpx.get(services.site_url("acme"))
+        assert page.status_code == 200 and "<html" in page.text.lower()
+        assert services.requests == 2
+
+        services.error_rate = 1.0
+        assert httpx.get(services.site_url("acme")).status_code == 503
@@ -0,0 +1,78 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import os
+import time
+
+import pytest
+
+from src.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=4000)
+
+
+def page(kilobytes: float) -> str:
+    """A value that compresses to about ``kilobytes`` KB (hex of random bytes halves under zstd)."""
+    return os.urandom(int(kilobytes * 1000)).hex()
+
+
+def test_values_round_trip(cache):
+    cache.set("search", "k", {"results": [1, 2, 3]}, ttl=60)
+    assert cache.get("search", "k") == {"results": [1, 2, 3]}
+    assert cache.get("search", "missing") is None
+    assert cache.get("other", "k") is None
+
+
+def test_entries_expire_after_their_ttl(cache):
+    cache.set("search", "short", "a", ttl=0.1)
+    cache.set("search", "long", "b", ttl=60)
+    time.sleep(0.15)
+    assert cache.get("search", "short") is None
+    assert cache.get("search", "long") == "b"
+
+
+def test_least_recently_used_entries_are_evicted_past_the_size_bound(cache):
+    for i in range(3):
+        cache.set("pages", f"page{i}", page(1), ttl=60)
+        time.sleep(0.01)
+    assert cache.get("pages", "page0") is not None  # page0 is now the most recently used
+    time.sleep(0.01)
+    cache.set("pages", "page3", page(1), ttl=60)
+    cache.set("pages", "page4", page(1), ttl=60)
+
+    assert cache._size <= cache.max_bytes
+    assert cache.get("pages", "page1") is None
+    assert cache.get("pages", "page2") is None
+    assert cache.get("pages", "page0") is not None
+    assert cache.get("pages", "page4") is not None
+
+
+def test_expired_entries_are_evicted_first(cache):
+    cache.set("pages", "kept", page(1.5), ttl=60)
+    time.sleep(0.01)
+    # More recently used than "kept", but expired by the time the cache fills up
+    cache.set("pages", "stale", page(1.5), ttl=0.05)
+    time.sleep(0.1)
+    cache.set("pages", "new", page(1.5), ttl=60)
+    assert cache._conn.execute("SELECT COUNT(*) FROM entries WHERE key = 'stale'").fetchone()[0] == 0
+    assert cache.get("pages", "kept") is not None
+    assert cache.get("pages", "new") is not None
+    assert cache._size <= cache.max_bytes
+
+
+def test_size_survives_reopening(cache):
+    cache.set("pages", "a", "x" * 5000, ttl=60)
+    reopened = ResponseCache(cache.path, cache.max_bytes)
+    assert reopened._size == cache._size > 0
+
+
+def test_make_key_ignores_case_and_whitespace_of_queries():
+    first = ResponseCache.make_key({"q": "Acme  News", "engine": "google_news"})
+    assert first == ResponseCache.make_key({"engine": "google_news", "q": " acme news"})
+    assert first != ResponseCache.make_key({"q": "Acme News", "engine": "google"})
+    assert ResponseCache.make_key({"q": "a", "api_key": "1"}, ["q"]) == ResponseCache.make_key({"q": "a", "api_key": "2"}, ["q"])
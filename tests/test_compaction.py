@@ -0,0 +1,77 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import json
+
+from src.compaction import compact_evidence, count_tokens, truncate_to_tokens
+
+
+def result(i: int, snippet: str = None) -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://news.example.com/{i}",
+        "source": "Example News",
+        "thumbnail": f"https://img.example.com/{i}.png",
+        "position": i,
+        "snippet": snippet or f"Acme announced partnership number {i} with a regional distributor.",
+    }
+
+
+def test_evidence_fits_the_budget():
+    evidence = {
+        "website": "Acme builds bridges. " * 400,
+        "news": json.dumps([result(i) for i in range(50)]),
+    }
+    compacted, stats = compact_evidence(evidence, budget=400)
+    assert set(compacted) == {"website", "news"}
+    # Each source gets an equal share; the truncation marker may add a token or two
+    assert all(count_tokens(text) <= 200 + 5 for text in compacted.values())
+    assert stats["tokens_before"] > stats["tokens_after"] == sum(count_tokens(text) for text in compacted.values())
+    assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"]
+
+
+def test_whole_results_are_dropped_before_text_is_cut():
+    compacted, _ = compact_evidence({"news": json.dumps([result(i) for i in range(50)])}, budget=150)
+    lines = compacted["news"].splitlines()
+    assert lines and all(line.startswith("- [Article ") for line in lines)
+    assert not compacted["news"].endswith(" ...")
+
+
+def test_repeated_links_and_snippets_are_dropped_across_sources():
+    shared = result(1)
+    evidence = {
+        "news": json.dumps([shared, result(2)]),
+        "financial": json.dumps({"search_results": [shared, result(3, snippet=shared["snippet"])], "related_searches": ["acme stock"]}),
+        "competitors": json.dumps({"search_results": [result(4)]}),
+    }
+    compacted, _ = compact_evidence(evidence, budget=10000)
+    combined = "\n".join(compacted.values())
+    assert combined.count(shared["link"]) == 1
+    assert combined.count(shared["snippet"]) == 1
+    assert "https://news.example.com/3" not in combined
+    assert "https://news.example.com/4" in compacted["competitors"]
+    assert "acme stock" not in combined
+
+
+def test_noise_fields_are_dropped_from_knowledge_graphs():
+    raw = json.dumps({"knowledge_graph": {"title": "Acme", "founded": "1999", "header_images": [{"image": "x"}], "kgmid": "/m/1", "website_link": "https://acme.com"}})
+    compacted, _ = compact_evidence({"financial": raw}, budget=1000)
+    assert compacted["financial"].splitlines() == ["title: Acme", "founded: 1999"]
+
+
+def test_repeated_sentences_are_dropped_from_page_text():
+    compacted, _ = compact_evidence({"website": "We build bridges. We build bridges! Our bridges last."}, budget=1000)
+    assert compacted["website"] == "We build bridges. Our bridges last."
+
+
+def test_truncation_prefers_a_sentence_boundary():
+    text = "First sentence here. " * 20 + "unterminated tail " * 20
+    cut = truncate_to_tokens(text, 60)
+    assert cut.endswith("here. ...")
+    assert truncate_to_tokens("short", 60) == "short"
+
+
+def test_empty_evidence():
+    assert compact_evidence({}, budget=100) == ({}, {"tokens_before": 0, "tokens_after": 0, "tokens_saved": 0})
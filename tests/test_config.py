@@ -0,0 +1,64 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import pytest
+
+from src.config import Config
+from src.fake_llm import ScriptedChatModel
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    """Route nodes to named stand-in models, created without any provider SDK."""
+    created = []
+
+    def create(cls, model_name):
+        created.append(model_name)
+        return ScriptedChatModel(model_name=model_name)
+
+    monkeypatch.setattr(Config, "_llm_override", None)
+    monkeypatch.setattr(Config, "_models", {})
+    monkeypatch.setattr(type(Config), "_create_model", create)
+    monkeypatch.setattr(Config, "MODEL_NAME", "default-model")
+    monkeypatch.setattr(Config, "NODE_MODELS", {
+        "research_agent": "fast-model",
+        "reviewer": "fast-model",
+        "researcher": "writer-model",
+        "rewriter": "writer-model",
+        "refresh_news": None,
+    })
+    return created
+
+
+def test_nodes_get_their_tier_and_share_instances(routing):
+    assert Config.model_for("researcher").model_name == "writer-model"
+    assert Config.model_for("reviewer").model_name == "fast-model"
+    assert Config.model_for("rewriter") is Config.model_for("researcher")
+    assert Config.model_for("research_agent") is Config.model_for("reviewer")
+    assert sorted(routing) == ["fast-model", "writer-model"]
+
+
+def test_unrouted_nodes_fall_back_to_the_default_model(routing):
+    assert Config.model_for("refresh_news").model_name == "default-model"
+    assert Config.model_for("unknown_node").model_name == "default-model"
+    assert routing == ["default-model"]
+
+
+def test_an_override_serves_every_node(routing):
+    override = ScriptedChatModel(model_name="override")
+    Config.LLM = override
+    assert Config.model_for("researcher") is override
+    assert Config.model_for("reviewer") is override
+    assert routing == []
+
+
+def test_the_fake_model_needs_no_api_key(monkeypatch):
+    monkeypatch.setattr(Config, "_llm_override", None)
+    monkeypatch.setattr(Config, "_models", {})
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "NODE_MODELS", {"researcher": "fake"})
+    model = Config.model_for("researcher")
+    assert isinstance(model, ScriptedChatModel)
+    assert model.cache is None
@@ -0,0 +1,51 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import time
+
+import pytest
+
+from src import crawler
+from src.config import Config
+from src.utils import KeyedLeases
+
+
+@pytest.fixture(autouse=True)
+def fresh_gates(monkeypatch):
+    monkeypatch.setattr(Config, "CRAWL_DOMAIN_DELAY", 0.2)
+    monkeypatch.setattr(crawler, "_gates", KeyedLeases(crawler._DomainGate, expires_at=lambda gate: gate._next_start))
+
+
+def test_delay_holds_across_an_idle_gate():
+    with crawler._gate_slot("https://www.acme.com/"):
+        pass
+    started = time.monotonic()
+    with crawler._gate_slot("https://acme.com/about"):
+        assert time.monotonic() - started >= 0.15
+
+
+def test_idle_gates_are_dropped_once_their_delay_has_passed():
+    for i in range(100):
+        with crawler._gate_slot(f"https://site{i}.com/"):
+            pass
+    assert len(crawler._gates) == 100
+    time.sleep(0.25)
+    with crawler._gate_slot("https://other.com/"):
+        assert len(crawler._gates) == 1
+
+
+def test_async_gates_are_dropped_once_their_delay_has_passed():
+    async def main() -> int:
+        async def fetch(url: str) -> None:
+            async with crawler._agate_slot(url):
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(fetch(f"https://site{i}.com/") for i in range(100)))
+        await asyncio.sleep(0.25)
+        await fetch("https://other.com/")
+        return len(crawler._async_gates[asyncio.get_running_loop()])
+
+    assert asyncio.run(main()) == 1
@@ -0,0 +1,80 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+
+from src.extract import aextract_stream, extract_html, extract_stream
+
+PAGE = (
+    "<html><head><title> Acme &amp; Co </title>"
+    '<meta property="og:description" content="OG text"><meta name="description" content="We build bridges.">'
+    "<script>var tracking = 1;</script><style>p { color: red }</style></head>"
+    '<body><nav><a href="/about">About us</a></nav><h1>Welcome</h1><p>Bridges<br>since 1999.</p>'
+    '<footer>Copyright</footer></body></html>'
+)
+
+
+def chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_extracts_title_description_text_and_links():
+    page = extract_html(PAGE.encode(), max_chars=1000)
+    assert page["title"] == "Acme & Co"
+    assert page["meta_description"] == "We build bridges."
+    assert page["text"] == "Welcome Bridges since 1999."
+    assert page["links"] == [("/about", "About us")]
+    assert page["bytes_read"] == len(PAGE.encode())
+
+
+def test_og_description_is_the_fallback():
+    page = extract_html(b'<meta property="og:description" content="OG text"><p>x</p>', max_chars=100)
+    assert page["meta_description"] == "OG text"
+
+
+def test_download_stops_once_enough_text_is_collected():
+    body = ("<html><body>" + "<p>Paragraph of filler text about the company.</p>" * 2000 + "</body></html>").encode()
+    consumed = []
+
+    def tracked():
+        for chunk in chunks(body, 1024):
+            consumed.append(chunk)
+            yield chunk
+
+    page = extract_stream(tracked(), max_chars=500, max_bytes=len(body))
+    assert len(page["text"]) == 500
+    assert page["bytes_read"] < 4096
+    assert sum(map(len, consumed)) == page["bytes_read"]
+
+
+def test_reading_stops_at_max_bytes():
+    body = ("<p>" + "word " * 10000 + "</p>").encode()
+    page = extract_stream(chunks(body, 1000), max_chars=10 ** 6, max_bytes=2500)
+    assert page["bytes_read"] == 2500
+    assert len(page["text"]) < 2500
+
+
+def test_multibyte_characters_split_across_chunks_are_decoded():
+    body = "<p>Zürich – café ☕ Ωmega</p>".encode("utf-8")
+    page = extract_stream(chunks(body, 1), max_chars=100, max_bytes=len(body))
+    assert page["text"] == "Zürich – café ☕ Ωmega"
+
+
+def test_the_declared_charset_is_used():
+    body = "<p>Société Générale</p>".encode("latin-1")
+    assert extract_html(body, 100, "latin-1")["text"] == "Société Générale"
+    # An unknown charset falls back to UTF-8 with replacement characters instead of failing
+    assert extract_html(body, 100, "not-a-charset")["text"].startswith("Soci�")
+
+
+def test_async_extraction_matches_sync():
+    body = PAGE.encode()
+
+    async def achunks():
+        for chunk in chunks(body, 7):
+            yield chunk
+
+    assert asyncio.run(aextract_stream(achunks(), 1000, len(body))) == extract_stream(chunks(body, 7), 1000, len(body))
@@ -0,0 +1,86 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import time
+
+import pytest
+
+from src.config import Config
+from src.graph import check_freshness, compile_graph
+from src.report_store import ReportStore, StoredReport, get_report_store
+from src.researcher import CompanyResearcher
+from src.utils import normalize_domain
+from src.validation import NEWS_SECTION, section_text
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def reuse(offline, monkeypatch):
+    monkeypatch.setattr(Config, "REPORT_FRESH_DAYS", 7.0)
+    monkeypatch.setattr(Config, "REPORT_REFRESH_DAYS", 30.0)
+    return offline
+
+
+def store_report(website: str, accepted_days_ago: float, researched_days_ago: float, report: str = "# Acme") -> None:
+    """Write a report for ``website`` as if it was accepted and researched the given number of days ago."""
+    now = time.time()
+    store = get_report_store()
+    store._write([StoredReport("Acme", normalize_domain(website), "Tech", now - accepted_days_ago * DAY, now - researched_days_ago * DAY, 8, False, report)])
+
+
+def freshness(website: str) -> str:
+    return check_freshness({"company_name": "Acme", "company_website": website, "industry": "Tech"})["freshness"]
+
+
+def test_check_freshness_routes_by_report_age(reuse):
+    # Every fake site shares one host, so the routing cases use domains of their own
+    sites = {name: f"https://{name}.example.com" for name in ("fresh", "stale", "old", "refreshed", "chained")}
+    store_report(sites["fresh"], 1, 1)
+    store_report(sites["stale"], 10, 10)
+    store_report(sites["old"], 40, 40)
+    # Refreshed a day ago: fresh again, whatever its research date
+    store_report(sites["refreshed"], 1, 25)
+    # Refreshed 10 days ago, but researched 35 days ago: no further refresh
+    store_report(sites["chained"], 10, 35)
+
+    assert freshness(sites["fresh"]) == "fresh"
+    assert freshness(sites["stale"]) == "stale"
+    assert freshness(sites["old"]) == "none"
+    assert freshness(sites["refreshed"]) == "fresh"
+    assert freshness(sites["chained"]) == "none"
+    assert freshness("https://unknown.example.com") == "none"
+
+
+def test_a_stored_report_from_another_industry_is_not_reused(reuse):
+    services, _ = reuse
+    store_report(services.site_url("acme"), 1, 1)
+    state = {"company_name": "Acme", "company_website": services.site_url("acme"), "industry": "Retail"}
+    assert check_freshness(state)["freshness"] == "none"
+
+
+def test_a_news_refresh_keeps_the_research_date(reuse, monkeypatch):
+    services, model = reuse
+    monkeypatch.setattr(Config, "REPORT_FILES_ENABLED", False)
+    website = services.site_url("acme")
+    report = model._report("https://example.com/source")
+    store_report(website, 10, 20, report)
+    researched_at = get_report_store().latest(website).researched_at
+
+    result = CompanyResearcher(compile_graph()).research_company("Acme", website, "Tech")
+    assert result["freshness"] == "refreshed"
+    assert section_text(result["final_report"], NEWS_SECTION) != section_text(report, NEWS_SECTION)
+    refreshed = get_report_store().latest(website)
+    assert refreshed.report == result["final_report"]
+    assert time.time() - refreshed.created_at < 60
+    assert refreshed.researched_at == researched_at
+
+    get_report_store().flush()
+    reopened = ReportStore(Config.REPORT_STORE_PATH)
+    try:
+        assert reopened.latest(website).researched_at == researched_at
+    finally:
+        reopened.close()
+
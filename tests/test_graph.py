@@ -0,0 +1,58 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+from langchain_core.messages import ToolMessage
+
+from src.config import Config
+from src.graph import EVIDENCE_SOURCES, _evidence_gaps, _merge_tool_evidence, compile_graph
+from src.researcher import CompanyResearcher
+
+
+def run(services, company: str = "acme"):
+    return CompanyResearcher(compile_graph()).research_company(company.title(), services.site_url(company), "Tech")
+
+
+def test_all_evidence_is_gathered_before_the_report_is_written(offline):
+    services, model = offline
+    result = run(services)
+
+    assert set(result["evidence"]) == set(EVIDENCE_SOURCES)
+    assert _evidence_gaps(result["evidence"]) == []
+    # A single researcher call (the pre-screen grades the report): the gap-filling agent was never needed
+    assert len(model.prompts) == 1
+    assert all(f"### {heading}" in model.prompts[0] for heading in EVIDENCE_SOURCES.values())
+
+
+def test_evidence_gaps_are_missing_or_failed_sources():
+    evidence = {"website": "Acme builds bridges", "news": "Error fetching news: timeout", "financial": ""}
+    assert _evidence_gaps(evidence) == ["news", "financial", "competitors"]
+
+    messages = [
+        ToolMessage(content="[news]", name="search_company_news_tool", tool_call_id="1"),
+        ToolMessage(content="ignored", name="unrelated_tool", tool_call_id="2"),
+    ]
+    assert _merge_tool_evidence(evidence, messages) == {**evidence, "news": "[news]"}
+
+
+def test_a_rewrite_is_one_call_on_the_stored_evidence(offline, monkeypatch):
+    services, model = offline
+    monkeypatch.setattr(Config, "REVIEW_PRESCREEN_ENABLED", False)
+    monkeypatch.setattr(Config, "REPORT_FILES_ENABLED", False)
+    run(services)
+    requests_without_rewrite = services.requests
+
+    model.prompts.clear()
+    model.rewrite_rate = 1.0
+    result = run(services)
+
+    assert result["rewritten"] is True
+    # Researcher, review, rewrite, review: at most one rewrite, even though every review asks for one
+    assert len(model.prompts) == 4
+    rewrite = model.prompts[2]
+    assert "A reviewer has asked for it to be rewritten" in rewrite
+    assert "Scripted evaluation." in rewrite
+    assert all(f"### {heading}" in rewrite for heading in EVIDENCE_SOURCES.values())
+    # The rewrite fetched nothing: both runs made the same requests
+    assert services.requests - requests_without_rewrite == requests_without_rewrite
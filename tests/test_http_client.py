@@ -0,0 +1,69 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import threading
+import time
+
+from src import http_client
+from src.utils import KeyedLeases
+
+
+def test_leases_are_dropped_when_the_last_user_leaves():
+    leases = KeyedLeases(object)
+    with leases.lease("a.com") as first:
+        with leases.lease("a.com") as second:
+            assert first is second
+        assert len(leases) == 1
+    assert len(leases) == 0
+
+
+def test_idle_leases_linger_until_they_expire():
+    leases = KeyedLeases(object, expires_at=lambda _: time.monotonic() + 0.1)
+    with leases.lease("a.com") as first:
+        pass
+    with leases.lease("a.com") as again:
+        assert again is first
+    time.sleep(0.15)
+    with leases.lease("b.com"):
+        # a.com expired and was swept
+        assert len(leases) == 1
+
+
+def test_host_slots_bound_concurrency_and_are_evicted(monkeypatch):
+    monkeypatch.setattr(http_client.Config, "HTTP_MAX_PER_HOST", 2)
+    monkeypatch.setattr(http_client, "_host_slots", KeyedLeases(lambda: threading.BoundedSemaphore(2)))
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def request(url: str) -> None:
+        counted = url.startswith("https://a.com")
+        with http_client._host_slot(url):
+            with lock:
+                active[0] += counted
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= counted
+
+    threads = [threading.Thread(target=request, args=("https://a.com/page",)) for _ in range(6)]
+    threads += [threading.Thread(target=request, args=(f"https://host{i}.com/",)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert len(http_client._host_slots) == 0
+
+
+def test_async_host_slots_are_evicted():
+    async def main() -> int:
+        async def request(url: str) -> None:
+            async with http_client._ahost_slot(url):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request(f"https://host{i % 50}.com/") for i in range(500)))
+        return len(http_client._async_host_slots[asyncio.get_running_loop()])
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,40 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported on first use only: the chat model client, the CSV reader and the tokenizer
+LAZY_MODULES = ("langchain_openai", "openai", "pandas", "tiktoken")
+# Generous bound on the cumulative import time of the graph module (it is about 0.6 s)
+MAX_IMPORT_SECONDS = 3.0
+
+
+def import_times(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter and return the cumulative seconds per imported module."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env={**os.environ, "PYTHONPATH": ROOT}, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_graph_import_skips_heavy_dependencies():
+    times = import_times("src.graph")
+    assert "src.graph" in times
+    assert [name for name in LAZY_MODULES if name in times] == []
+
+
+def test_graph_import_time():
+    assert import_times("src.graph")["src.graph"] < MAX_IMPORT_SECONDS
@@ -0,0 +1,68 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import json
+
+import pytest
+
+from src.config import Config
+from src.ingest import CompanyIngest
+from src.report_store import get_report_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "REPORT_STORE_PATH", str(tmp_path / "reports.sqlite3"))
+    get_report_store.cache_clear()
+    yield get_report_store()
+    get_report_store().close()
+    get_report_store.cache_clear()
+
+
+def write_csv(tmp_path, text: str) -> str:
+    path = tmp_path / "companies.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_rows_are_deduplicated_by_domain(tmp_path):
+    path = write_csv(tmp_path, (
+        "Company_Name,Website,Industry\n"
+        "Acme,https://www.acme.com/,Tech\n"
+        "Acme Inc,http://acme.com/about,Tech\n"
+        ",globex.com,Retail\n"
+        "No Site,,Retail\n"
+        "Initech,  initech.com extra,Finance\n"
+    ))
+    ingest = CompanyIngest(path, chunk_size=2, fresh_days=0)
+    assert list(ingest) == [
+        ("Acme", "https://www.acme.com/", "Tech"),
+        ("GLOBEX", "globex.com", "Retail"),
+        ("Initech", "initech.com", "Finance"),
+    ]
+    assert (ingest.rows, ingest.companies, ingest.duplicates, ingest.invalid, ingest.fresh) == (5, 3, 1, 1, 0)
+
+
+def test_jsonl_lists_and_malformed_lines(tmp_path):
+    path = tmp_path / "companies.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"name": "Acme", "url": "acme.com", "sector": "Tech"}),
+        "{not json",
+        "",
+        json.dumps({"domain": "globex.com"}),
+    ]), encoding="utf-8")
+    assert list(CompanyIngest(str(path), fresh_days=0)) == [("Acme", "acme.com", "Tech"), ("GLOBEX", "globex.com", "")]
+
+
+def test_companies_with_a_fresh_report_for_their_industry_are_skipped(tmp_path, store):
+    store.save("Acme", "acme.com", "Tech", "# Acme")
+    store.save("Globex", "globex.com", "Retail", "# Globex")
+    path = write_csv(tmp_path, "name,website,industry\nAcme,acme.com,Tech\nGlobex,globex.com,Energy\nInitech,initech.com,Finance\n")
+
+    ingest = CompanyIngest(path, fresh_days=7)
+    assert [name for name, _, _ in ingest] == ["Globex", "Initech"]
+    assert ingest.fresh == 1
+    # With freshness off every company is queued
+    assert len(list(CompanyIngest(path, fresh_days=0))) == 3
@@ -0,0 +1,79 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import pytest
+
+from src.cache import ResponseCache
+from src.fake_llm import ScriptedChatModel
+from src.llm_cache import LLMResponseCache
+
+
+class CountingChatModel(ScriptedChatModel):
+    """The scripted model with a temperature, counting the calls that reach it."""
+
+    temperature: float = 0.0
+    calls: int = 0
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _respond(self, messages, tools):
+        self.calls += 1
+        return super()._respond(messages, tools)
+
+
+@pytest.fixture
+def llm_cache(tmp_path):
+    return LLMResponseCache(ResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=10 ** 7), ttl=60)
+
+
+def test_a_repeated_prompt_is_answered_from_the_cache(llm_cache):
+    model = CountingChatModel(cache=llm_cache)
+    first = model.invoke("Write a report on Acme")
+    second = model.invoke("Write a report on Acme")
+    assert model.calls == 1
+    assert second.content == first.content
+    assert first.usage_metadata["total_tokens"] > 0
+    # No tokens were spent on the replayed response
+    assert second.usage_metadata is None
+    assert second.response_metadata["cached"] is True
+
+    model.invoke("Write a report on Globex")
+    assert model.calls == 2
+
+
+def test_entries_are_keyed_by_model_and_temperature(llm_cache):
+    models = [
+        CountingChatModel(cache=llm_cache),
+        CountingChatModel(cache=llm_cache, model_name="other"),
+        CountingChatModel(cache=llm_cache, temperature=0.7),
+    ]
+    for model in models:
+        model.invoke("Write a report on Acme")
+    assert [model.calls for model in models] == [1, 1, 1]
+
+    # A new instance with the same settings shares the entries
+    same = CountingChatModel(cache=llm_cache, temperature=0.7)
+    same.invoke("Write a report on Acme")
+    assert same.calls == 0
+
+
+def test_tool_calls_survive_the_round_trip(llm_cache):
+    from src.graph import EvalSchema
+
+    model = CountingChatModel(cache=llm_cache)
+    grader = model.with_structured_output(EvalSchema)
+    first = grader.invoke("Grade this report")
+    assert grader.invoke("Grade this report") == first
+    assert model.calls == 1
+
+
+def test_clear_drops_every_response(llm_cache):
+    model = CountingChatModel(cache=llm_cache)
+    model.invoke("Write a report on Acme")
+    llm_cache.clear()
+    model.invoke("Write a report on Acme")
+    assert model.calls == 2
@@ -0,0 +1,66 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import threading
+
+import pytest
+
+from src.extract import extract_html
+from src.parse_pool import ParsePool
+
+
+PAGE = (
+    b"<html><head><title>Acme</title><meta name='description' content='We make things'></head><body>"
+    + b"<p>Acme builds widgets for the construction industry.</p>" * 2000
+    + b"<a href='/about'>About us</a></body></html>"
+)
+
+
+@pytest.fixture
+def pool():
+    pool = ParsePool(workers=2, max_tasks_per_child=5, queue_size=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_pages_parse_the_same_as_inline(pool):
+    expected = extract_html(PAGE, 3000)
+    # More pages than a worker parses before it is replaced
+    assert all(pool.parse(PAGE, 3000) == expected for _ in range(12))
+    assert asyncio.run(pool.aparse(PAGE, 3000)) == expected
+
+
+def test_a_pool_shut_down_by_another_caller_is_replaced(pool):
+    stale = pool._pool()
+    stale.shutdown()
+    assert pool.parse(PAGE, 3000)["title"] == "Acme"
+    assert pool._executor is not stale
+
+
+def test_concurrent_callers_survive_a_crashed_worker(pool):
+    expected = extract_html(PAGE, 3000)
+    results, errors = [], []
+
+    def parse() -> None:
+        try:
+            for _ in range(10):
+                results.append(pool.parse(PAGE, 3000))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=parse) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while not results:
+        pass
+    for process in list(pool._pool()._processes.values()):
+        process.kill()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(results) == 80
+    assert all(result == expected for result in results)
@@ -0,0 +1,172 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src import http_client, rate_limit
+from src.config import Config
+from src.rate_limit import RateLimitedChatModel, RateLimiter, get_limiter
+
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(status: int, headers: dict = None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    return openai.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+class FlakyChatModel(BaseChatModel):
+    """Raises the queued errors one call at a time, then answers "ok"."""
+
+    errors: list = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "flaky"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(Config, "HTTP_MAX_RETRIES", 3)
+    monkeypatch.setattr(rate_limit, "DECREASE_INTERVAL", 1.0)
+    get_limiter.cache_clear()
+    yield
+    get_limiter.cache_clear()
+
+
+def test_429_halves_the_limit_once_per_burst():
+    limiter = RateLimiter("test", 0, max_concurrency=8)
+    limiter.record(429)
+    assert limiter.limit == 4
+    # Further 429s from calls that were already in flight are the same signal
+    limiter.record(429)
+    assert limiter.limit == 4
+
+
+def test_server_errors_halve_the_limit_and_client_errors_do_not():
+    limiter = RateLimiter("test", 0, max_concurrency=8)
+    limiter.record(404)
+    assert limiter.limit == 8
+    limiter.record(503)
+    assert limiter.limit == 4
+
+
+def test_successes_grow_the_limit_back_to_its_bound():
+    limiter = RateLimiter("test", 0, max_concurrency=8)
+    limiter.record(429)
+    for _ in range(4):
+        limiter.record(None)
+    assert 4 < limiter.limit < 6
+    for _ in range(200):
+        limiter.record(None)
+    assert limiter.limit == 8
+
+
+def test_limit_never_drops_below_one(monkeypatch):
+    monkeypatch.setattr(rate_limit, "DECREASE_INTERVAL", 0.0)
+    limiter = RateLimiter("test", 0, max_concurrency=4)
+    for _ in range(5):
+        limiter.record(429)
+    assert limiter.limit == 1
+
+
+def test_retry_after_pauses_new_calls():
+    limiter = RateLimiter("test", 0, max_concurrency=4)
+    limiter.record(429, retry_after=0.3)
+    started = time.monotonic()
+    with limiter.slot():
+        pass
+    assert time.monotonic() - started >= 0.25
+
+
+def test_retry_after_pauses_new_async_calls():
+    limiter = RateLimiter("test", 0, max_concurrency=4)
+    limiter.record(429, retry_after=0.3)
+
+    async def enter() -> float:
+        started = time.monotonic()
+        async with limiter.aslot():
+            return time.monotonic() - started
+
+    assert asyncio.run(enter()) >= 0.25
+
+
+def test_retry_after_header():
+    assert http_client.retry_after(httpx.Response(429, headers={"Retry-After": "3"})) == 3
+    assert http_client.retry_after(httpx.Response(429, headers={"Retry-After": "9999"})) == Config.HTTP_MAX_BACKOFF
+    assert http_client.retry_after(httpx.Response(429)) is None
+    response = httpx.Response(429, headers={"Retry-After": "0.2"})
+    assert http_client.retry_delay(5, response) == 0.2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        openai.APIConnectionError(request=REQUEST),
+        openai.APITimeoutError(request=REQUEST),
+        httpx.ConnectError("connection refused"),
+        status_error(408),
+        status_error(409),
+    ],
+    ids=["connection", "timeout", "transport", "408", "409"],
+)
+def test_transient_errors_are_retried_without_lowering_the_limit(error):
+    inner = FlakyChatModel(errors=[error])
+    model = RateLimitedChatModel(inner=inner)
+    assert model.invoke("hi").content == "ok"
+    assert inner.calls == 2
+    assert model.limiter.limit == Config.OPENAI_MAX_CONCURRENCY
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_server_errors_are_retried_and_lower_the_limit(status):
+    inner = FlakyChatModel(errors=[status_error(status)])
+    model = RateLimitedChatModel(inner=inner)
+    assert model.invoke("hi").content == "ok"
+    assert inner.calls == 2
+    assert model.limiter.limit < Config.OPENAI_MAX_CONCURRENCY / 2 + 1
+
+
+def test_429_is_retried_and_lowers_the_limit():
+    inner = FlakyChatModel(errors=[status_error(429, {"Retry-After": "0"})])
+    model = RateLimitedChatModel(inner=inner)
+    assert asyncio.run(model.ainvoke("hi")).content == "ok"
+    assert inner.calls == 2
+    # Halved by the 429, then grown a little by the successful retry
+    assert Config.OPENAI_MAX_CONCURRENCY / 2 <= model.limiter.limit < Config.OPENAI_MAX_CONCURRENCY / 2 + 1
+
+
+@pytest.mark.parametrize("error", [status_error(400), ValueError("bad prompt")], ids=["400", "other"])
+def test_other_errors_are_not_retried(error):
+    inner = FlakyChatModel(errors=[error])
+    model = RateLimitedChatModel(inner=inner)
+    with pytest.raises(type(error)):
+        model.invoke("hi")
+    assert inner.calls == 1
+
+
+def test_retries_give_up_after_max_retries():
+    inner = FlakyChatModel(errors=[openai.APIConnectionError(request=REQUEST) for _ in range(10)])
+    model = RateLimitedChatModel(inner=inner)
+    with pytest.raises(openai.APIConnectionError):
+        model.invoke("hi")
+    assert inner.calls == Config.HTTP_MAX_RETRIES + 1
@@ -0,0 +1,106 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import sqlite3
+import threading
+
+import pytest
+
+from src.report_store import ReportStore, same_industry
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.sqlite3"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def held_writes(store, monkeypatch):
+    """Hold the writer thread until the returned event is set."""
+    release = threading.Event()
+    write = store._write
+
+    def held(reports):
+        release.wait(5)
+        write(reports)
+
+    monkeypatch.setattr(store, "_write", held)
+    return release
+
+
+def test_queued_reports_are_visible_before_they_are_written(store, held_writes):
+    store.save("Acme", "https://www.acme.com/", "Tech", "# Acme", score=8)
+    stored = store.latest("acme.com")
+    assert stored.report == "# Acme"
+    assert store.latest_created_at("https://acme.com") == stored.created_at
+    assert store._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 0
+
+    held_writes.set()
+    store.flush()
+    assert store._pending == {}
+    written = store.latest("acme.com")
+    assert (written.report, written.score, written.created_at) == ("# Acme", 8, stored.created_at)
+
+
+def test_a_newer_queued_report_wins_over_a_written_one(store, held_writes):
+    held_writes.set()
+    store.save("Acme", "acme.com", "Tech", "first")
+    store.flush()
+    held_writes.clear()
+    store.save("Acme", "acme.com", "Tech", "second", rewritten=True)
+    assert store.latest("acme.com").report == "second"
+    held_writes.set()
+    store.flush()
+    assert store.latest("acme.com").report == "second"
+    assert store.latest("acme.com").rewritten is True
+
+
+def test_reports_survive_reopening(store, tmp_path):
+    store.save("Acme", "acme.com", "Tech", "report " * 1000)
+    store.close()
+    reopened = ReportStore(store.path)
+    try:
+        assert reopened.latest("acme.com").report == "report " * 1000
+        assert reopened.latest("other.com") is None
+    finally:
+        reopened.close()
+
+
+def test_latest_created_at_matches_industry(store):
+    store.save("Acme", "acme.com", "Construction", "report")
+    store.flush()
+    assert store.latest_created_at("acme.com", "construction ") is not None
+    assert store.latest_created_at("acme.com", "Retail") is None
+    assert store.latest_created_at("acme.com") is not None
+    assert store.latest_created_at("other.com") is None
+
+
+def test_same_industry():
+    assert same_industry("Tech", " tech")
+    assert same_industry("", "Tech")
+    assert same_industry("Tech", None)
+    assert not same_industry("Tech", "Retail")
+
+
+def test_stores_without_a_research_date_column_are_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE reports (id INTEGER PRIMARY KEY, company_name TEXT NOT NULL, domain TEXT NOT NULL, industry TEXT NOT NULL, "
+            "created_at REAL NOT NULL, score INTEGER, rewritten INTEGER NOT NULL, report BLOB NOT NULL)"
+        )
+    store = ReportStore(path)
+    try:
+        store.save("Acme", "acme.com", "Tech", "# Acme", researched_at=1000.0)
+        store.flush()
+        assert store.latest("acme.com").researched_at == 1000.0
+        # Rows written before the migration fall back to their acceptance time
+        store._conn.execute("UPDATE reports SET researched_at = NULL")
+        stored = store.latest("acme.com")
+        assert stored.researched_at == stored.created_at
+    finally:
+        store.close()
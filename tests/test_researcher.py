@@ -0,0 +1,129 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from src.config import Config
+from src.graph import build_workflow, compile_graph
+from src.researcher import CompanyResearcher
+
+
+def research_twice(researcher: CompanyResearcher, website: str):
+    async def main():
+        first = await researcher._aresearch_company("Acme", website, "Tech", None, False, False)
+        second = await researcher._aresearch_company("Acme", website, "Tech", None, False, False)
+        return first, second
+
+    return asyncio.run(main())
+
+
+def researcher_prompts(model) -> list:
+    return [prompt for prompt in model.prompts if "Evaluation feedback if any" in prompt]
+
+
+def test_a_finished_thread_is_reused_while_fresh(offline, monkeypatch):
+    services, model = offline
+    monkeypatch.setattr(Config, "REPORT_FRESH_DAYS", 7.0)
+    researcher = CompanyResearcher(compile_graph(checkpointer=MemorySaver()))
+
+    (first, skipped_first), (second, skipped_second) = research_twice(researcher, services.site_url("acme"))
+    assert (skipped_first, skipped_second) == (False, True)
+    assert second["final_report"] == first["final_report"]
+    assert len(researcher_prompts(model)) == 1
+
+
+def test_a_rerun_on_a_finished_thread_starts_from_a_clean_slate(offline):
+    services, model = offline
+    researcher = CompanyResearcher(compile_graph(checkpointer=MemorySaver()))
+
+    (first, _), (second, skipped) = research_twice(researcher, services.site_url("acme"))
+    assert first["llm_evaluation"]["score"] == 8
+    assert skipped is False
+
+    prompts = researcher_prompts(model)
+    assert len(prompts) == 2
+    # Neither run's researcher saw a review: the second must not inherit the first's
+    assert all(prompt.rstrip().endswith("Evaluation feedback if any: None") for prompt in prompts)
+    assert second["freshness"] == "none"
+    assert set(second["token_savings"]) == set(first["token_savings"])
+
+
+def test_an_interrupted_thread_resumes_from_its_last_node(offline):
+    services, model = offline
+    checkpointer = MemorySaver()
+    interrupted = CompanyResearcher(build_workflow().compile(checkpointer=checkpointer, interrupt_before=["reviewer"]))
+    researcher = CompanyResearcher(compile_graph(checkpointer=checkpointer))
+    website = services.site_url("acme")
+
+    async def main():
+        await interrupted._aresearch_company("Acme", website, "Tech", None, False, False)
+        requests = services.requests
+        result, skipped = await researcher._aresearch_company("Acme", website, "Tech", None, False, False)
+        return result, skipped, services.requests - requests
+
+    result, skipped, requests = asyncio.run(main())
+    assert skipped is False
+    assert result["llm_evaluation"]["score"] == 8
+    # The evidence and the report were not gathered and written again
+    assert requests == 0
+    assert len(researcher_prompts(model)) == 1
+
+
+def test_a_finished_thread_survives_a_restart(offline, tmp_path, monkeypatch):
+    services, model = offline
+    monkeypatch.setattr(Config, "REPORT_FRESH_DAYS", 7.0)
+    path = str(tmp_path / "checkpoints.sqlite3")
+    website = services.site_url("acme")
+
+    async def run():
+        # A new saver over the same file stands in for a restarted batch
+        async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+            return await CompanyResearcher(compile_graph(checkpointer=checkpointer))._aresearch_company("Acme", website, "Tech", None, False, False)
+
+    (first, skipped_first), (second, skipped_second) = asyncio.run(run()), asyncio.run(run())
+    assert (skipped_first, skipped_second) == (False, True)
+    assert second["final_report"] == first["final_report"]
+    assert len(researcher_prompts(model)) == 1
+
+
+class SleepingResearcher(CompanyResearcher):
+    """Stands in for the graph: each company sleeps for the seconds given as its industry."""
+
+    def __init__(self) -> None:
+        super().__init__(graph=None)
+        self.active = self.peak = 0
+
+    async def _aresearch_company(self, company_name, company_website, industry, timeout, stream, console):
+        async def research():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(float(industry))
+                if company_name.startswith("broken"):
+                    raise RuntimeError("scrape failed")
+                return {"final_report": f"# {company_name}"}, company_name.startswith("done")
+            finally:
+                self.active -= 1
+
+        return await asyncio.wait_for(research(), timeout=timeout or None)
+
+
+def test_a_batch_bounds_concurrency_and_isolates_failures():
+    companies = [(f"company{i}", f"https://company{i}.com", "0.02") for i in range(12)]
+    companies += [("broken", "https://broken.com", "0"), ("slow", "https://slow.com", "5"), ("done", "https://done.com", "0")]
+    researcher = SleepingResearcher()
+
+    summary = asyncio.run(researcher.aresearch_companies(iter(companies), concurrency=3, timeout=0.5))
+    assert researcher.peak == 3
+    assert (summary["total"], summary["succeeded"], summary["failed"], summary["timed_out"], summary["skipped"]) == (15, 12, 1, 1, 1)
+    assert summary["errors"] == {"broken": "scrape failed", "slow": "Timed out after 0.5s"}
+    assert summary["results"]["company0"] == {"final_report": "# company0"}
+    assert "slow" not in summary["results"]
+
+    summary = asyncio.run(SleepingResearcher().aresearch_companies(iter(companies[:3]), concurrency=2, keep_results=False))
+    assert summary["succeeded"] == 3 and summary["results"] == {}
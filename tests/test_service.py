@@ -0,0 +1,66 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+
+from src.service import JobManager
+
+
+class StreamingResearcher:
+    """Streams a report of ``tokens`` words, then finishes."""
+
+    def __init__(self, tokens: int = 500) -> None:
+        self.tokens = tokens
+
+    async def astream_company(self, company_name, company_website, industry):
+        yield {"type": "node", "node": "gather_evidence", "keys": ["evidence"]}
+        yield {"type": "report_start", "node": "researcher"}
+        for i in range(self.tokens):
+            yield {"type": "token", "node": "researcher", "text": f"word{i} "}
+            await asyncio.sleep(0)
+        yield {"type": "node", "node": "researcher", "keys": ["final_report"]}
+        yield {"type": "done", "report": "the report", "evaluation": {"score": 8, "rewrite": False, "evaluation": "good"}}
+
+
+async def run_job(manager: JobManager, live: list):
+    await manager.start()
+    job, _ = manager.submit("Acme", "https://acme.com", "Tech")
+
+    async def follow():
+        async for event in job.subscribe():
+            live.append(event)
+
+    follower = asyncio.create_task(follow())
+    while not job.finished:
+        await asyncio.sleep(0.01)
+    await follower
+    await manager.stop()
+    return job
+
+
+def test_finished_jobs_keep_no_token_events():
+    live = []
+    manager = JobManager(StreamingResearcher(), workers=1, queue_size=10, history=10)
+    job = asyncio.run(run_job(manager, live))
+
+    # A subscriber that followed the job live saw every token
+    assert sum(event["type"] == "token" for event in live) == 500
+    assert job.status == "succeeded"
+    assert job.evaluation["score"] == 8
+    assert [event["type"] for event in job.events] == ["status", "status", "node", "node", "done"]
+    assert job.events[-1]["report"] == "the report"
+
+
+def test_late_subscribers_get_the_final_report():
+    manager = JobManager(StreamingResearcher(tokens=50), workers=1, queue_size=10, history=10)
+    job = asyncio.run(run_job(manager, []))
+
+    async def replay():
+        return [event async for event in job.subscribe()]
+
+    events = asyncio.run(replay())
+    assert events[-1]["type"] == "done"
+    assert events[-1]["report"] == "the report"
+    assert not any(event["type"] == "token" for event in events)
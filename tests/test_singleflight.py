@@ -0,0 +1,107 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.singleflight import coalesce
+
+
+def test_concurrent_sync_calls_share_one_execution():
+    calls = []
+
+    @coalesce
+    def fetch(url: str) -> str:
+        calls.append(url)
+        time.sleep(0.1)
+        return f"page {url}"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch("https://acme.com/"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["https://acme.com/"]
+    assert results == ["page https://acme.com/"] * 8
+    # Nothing is kept once the call has finished
+    fetch("https://acme.com/")
+    assert len(calls) == 2
+
+
+def test_followers_get_the_leaders_exception():
+    @coalesce
+    def fetch(url: str) -> str:
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call() -> None:
+        try:
+            fetch("https://acme.com/")
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4
+
+
+def test_concurrent_async_calls_share_one_execution():
+    calls = []
+
+    @coalesce
+    async def fetch(url: str, max_pages: int = 5) -> str:
+        calls.append((url, max_pages))
+        await asyncio.sleep(0.05)
+        return f"page {url}"
+
+    async def main():
+        return await asyncio.gather(fetch("https://acme.com/"), fetch("https://acme.com/", 5), fetch(url="https://acme.com/"), fetch("https://acme.com/", 2))
+
+    results = asyncio.run(main())
+    assert calls == [("https://acme.com/", 5), ("https://acme.com/", 2)]
+    assert results == ["page https://acme.com/"] * 4
+
+
+def test_urls_differing_only_in_case_are_not_merged():
+    @coalesce
+    async def fetch(url: str) -> str:
+        await asyncio.sleep(0.05)
+        return url
+
+    async def main():
+        return await asyncio.gather(fetch("https://acme.com/About?id=A"), fetch("https://acme.com/about?id=a"))
+
+    assert asyncio.run(main()) == ["https://acme.com/About?id=A", "https://acme.com/about?id=a"]
+
+
+def test_cancelling_one_caller_does_not_cancel_the_call():
+    calls = []
+
+    @coalesce
+    async def fetch(url: str) -> str:
+        calls.append(url)
+        await asyncio.sleep(0.1)
+        return "page"
+
+    async def main():
+        first = asyncio.create_task(fetch("https://acme.com/"))
+        second = asyncio.create_task(fetch("https://acme.com/"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "page"
+    assert calls == ["https://acme.com/"]
@@ -0,0 +1,96 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import glob
+
+import pytest
+
+from src.config import Config
+from src.graph import compile_graph
+from src.researcher import CompanyResearcher
+from src.streaming import ReportStreamWriter
+
+
+@pytest.fixture
+def writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writer = ReportStreamWriter("Acme")
+    yield writer
+    writer.close()
+
+
+def read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_tokens_go_to_a_partial_file_until_the_report_is_accepted(writer):
+    writer.start("researcher")
+    writer.write("# Draft")
+    assert read(writer.partial_path).endswith("# Draft")
+    assert glob.glob("*.md") == [writer.partial_path]
+
+    assert writer.finalize("# Draft") == writer.path
+    assert glob.glob("*.md") == [writer.path]
+    assert read(writer.path).endswith("# Draft")
+
+
+def test_a_new_draft_starts_the_partial_file_over(writer):
+    writer.start("researcher")
+    writer.write("first draft")
+    writer.start("rewriter")
+    writer.write("second draft")
+    assert "first draft" not in read(writer.partial_path)
+    writer.finalize("second draft")
+    assert read(writer.path).endswith("second draft")
+
+
+def test_the_accepted_report_replaces_differing_streamed_text(writer):
+    writer.write("streamed")
+    writer.finalize("accepted")
+    content = read(writer.path)
+    assert content.endswith("accepted") and "streamed" not in content
+
+
+def test_a_failed_run_leaves_the_partial_file(writer):
+    writer.write("half a report")
+    writer.close()
+    assert glob.glob("*.md") == [writer.partial_path]
+    assert writer.finalize("") is None
+    assert glob.glob("*.md") == [writer.partial_path]
+
+
+def test_nothing_is_written_when_saving_is_off(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    writer = ReportStreamWriter("Acme", console=True, save=False)
+    writer.start("researcher")
+    writer.write("# Report")
+    assert writer.finalize("# Report") is None
+    assert glob.glob("*.md") == []
+    assert "# Report" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("files", [True, False])
+def test_streamed_and_plain_runs_save_the_same_files(offline, monkeypatch, capsys, stream, files):
+    services, _ = offline
+    monkeypatch.setattr(Config, "REPORT_FILES_ENABLED", files)
+    monkeypatch.setattr(Config, "REPORT_FRESH_DAYS", 7.0)
+    researcher = CompanyResearcher(compile_graph())
+
+    async def main():
+        first = await researcher.aresearch_company("Acme", services.site_url("acme"), "Tech", stream=stream)
+        # Reused from the report store, so it must not be saved again
+        second = await researcher.aresearch_company("Acme", services.site_url("acme"), "Tech", stream=stream)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert second["final_report"] == first["final_report"]
+    # Both saves of a doubly saved report could land on the same timestamped filename
+    assert capsys.readouterr().out.count("Report successfully saved") == (1 if files else 0)
+    reports = glob.glob("company_report_*.md")
+    assert len(reports) == (1 if files else 0)
+    assert not [path for path in reports if path.endswith(".partial.md")]
@@ -0,0 +1,82 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+import asyncio
+import json
+
+from src.graph import TOOL_EVIDENCE_SOURCES, compile_graph
+from src.researcher import CompanyResearcher
+from src.telemetry import Metrics, RunTracker, Telemetry, graph_routers
+
+
+class ToolRecorder(RunTracker):
+    """Keeps the name and graph node of every finished tool run."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.tools = []
+
+    def record(self, kind, run, seconds, error, output):
+        if kind == "tool":
+            self.tools.append((run.node, run.name))
+
+
+def test_evidence_lookups_are_traced_from_both_graph_apis(offline):
+    services, _ = offline
+    website = services.site_url("acme")
+    sync, async_ = ToolRecorder(), ToolRecorder()
+
+    CompanyResearcher(compile_graph(), callbacks=[sync]).research_company("Acme", website, "Tech")
+    asyncio.run(CompanyResearcher(compile_graph(), callbacks=[async_]).aresearch_company("Acme", website, "Tech"))
+
+    gathered = sorted(name for node, name in sync.tools if node == "gather_evidence")
+    assert len(gathered) == 4
+    assert set(gathered) <= set(TOOL_EVIDENCE_SOURCES)
+    assert gathered == sorted(name for node, name in async_.tools if node == "gather_evidence")
+
+
+def test_metrics_render_in_the_prometheus_text_format():
+    metrics = Metrics()
+    metrics.inc("calls_total", tool="news")
+    metrics.inc("calls_total", 2, tool="news")
+    metrics.inc("calls_total", tool='say "hi"\n')
+    metrics.set("concurrency", 4.5, provider="openai")
+    metrics.observe("seconds", 0.07)
+    metrics.observe("seconds", 3)
+
+    lines = metrics.render().splitlines()
+    assert metrics.value("calls_total", tool="news") == 3
+    assert 'calls_total{tool="news"} 3' in lines
+    assert 'calls_total{tool="say \\"hi\\"\\n"} 1' in lines
+    assert 'concurrency{provider="openai"} 4.5' in lines
+    assert 'seconds_bucket{le="0.05"} 0' in lines
+    assert 'seconds_bucket{le="0.1"} 1' in lines
+    assert 'seconds_bucket{le="5"} 2' in lines
+    assert 'seconds_bucket{le="+Inf"} 2' in lines
+    assert "seconds_sum 3.070000" in lines
+    assert "seconds_count 2" in lines
+    assert lines.count("# TYPE seconds histogram") == 1
+
+
+def test_every_company_gets_a_jsonl_summary(offline, tmp_path):
+    services, _ = offline
+    graph = compile_graph()
+    telemetry = Telemetry(str(tmp_path / "telemetry" / "events.jsonl"), routers=graph_routers(graph))
+    CompanyResearcher(graph, callbacks=[telemetry]).research_company("Acme", services.site_url("acme"), "Tech")
+    telemetry.close()
+
+    with open(telemetry.path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+    company = events[-1]
+    assert company["event"] == "company" and company["company"] == "Acme" and company["status"] == "ok"
+    assert {"check_freshness", "gather_evidence", "researcher", "reviewer", "to_rewrite"} <= set(company["nodes"])
+    tools = [(event["node"], event["tool"]) for event in events if event["event"] == "tool"]
+    # The four evidence lookups, then the accepted report is saved
+    assert company["tool_calls"] == len(tools) == 5
+    assert [node for node, _ in tools].count("gather_evidence") == 4
+    assert tools[-1][1] == "save_report_tool"
+    assert company["llm_calls"] == 1 and company["prompt_tokens"] > 0 and company["completion_tokens"] > 0
+    assert company["rewrites"] == 0
+    assert [event["node"] for event in events if event["event"] == "llm"] == ["researcher"]
@@ -0,0 +1,72 @@
+# -----------------------------------------------------
+# Author: Surya Bhosale
+# Date: 2025-06-11
+# Project: ThinkBridge Assignment
+# -----------------------------------------------------
+from src.validation import (
+    FACT_SHEET_HEADING, NEWS_SECTION, REQUIRED_SECTIONS, check_report, prescreen, replace_section, section_text,
+)
+
+
+def report(sections=REQUIRED_SECTIONS, words_per_section: int = 120, links: int = 6) -> str:
+    """A report with the fact sheet, the given sections and ``links`` distinct source links."""
+    parts = [f"## {FACT_SHEET_HEADING}", "- Founded: 2001"]
+    for section in sections:
+        parts += [f"## {section}", " ".join(["word"] * words_per_section)]
+    parts += ["## Sources"] + [f"- https://example{i}.com/page" for i in range(links)]
+    return "\n\n".join(parts)
+
+
+def test_check_report_counts_words_links_and_headings():
+    text = report(sections=REQUIRED_SECTIONS[:-1], words_per_section=10, links=3)
+    findings = check_report(text + "\n\nSee https://example0.com/page again.")
+    assert findings["links"] == 3
+    assert findings["fact_sheet"] is True
+    assert findings["missing_sections"] == [REQUIRED_SECTIONS[-1]]
+    assert findings["words"] >= 10 * len(REQUIRED_SECTIONS[:-1])
+
+
+def test_check_report_accepts_heading_variants():
+    text = "**EXECUTIVE FACT SHEET:**\n\n1. Business Model and Offerings\n\nText."
+    findings = check_report(text)
+    assert findings["fact_sheet"] is True
+    assert "Business Model & Offerings" not in findings["missing_sections"]
+
+
+def test_check_report_ignores_section_names_inside_long_paragraphs():
+    paragraph = "Executive Summary " + "filler " * 40
+    assert "Executive Summary" in check_report(paragraph)["missing_sections"]
+
+
+def test_prescreen_passes_complete_reports():
+    assert prescreen(check_report(report())) == "pass"
+
+
+def test_prescreen_fails_clearly_broken_reports():
+    assert prescreen(check_report(report(links=0))) == "fail"
+    assert prescreen(check_report(report(words_per_section=10))) == "fail"
+    assert prescreen(check_report(report(sections=REQUIRED_SECTIONS[3:]))) == "fail"
+    assert prescreen(check_report(report().replace(FACT_SHEET_HEADING, "Overview"))) == "fail"
+
+
+def test_prescreen_leaves_borderline_reports_to_the_llm():
+    assert prescreen(check_report(report(links=2))) is None
+    assert prescreen(check_report(report(sections=REQUIRED_SECTIONS[1:]))) is None
+
+
+def test_section_text_returns_the_body_up_to_the_next_section():
+    text = report(words_per_section=3)
+    assert section_text(text, NEWS_SECTION) == "word word word"
+    assert section_text(text, REQUIRED_SECTIONS[-1]).startswith("word word word")
+    assert section_text("no headings here", NEWS_SECTION) is None
+
+
+def test_replace_section_keeps_every_other_section():
+    text = report(words_per_section=3)
+    updated = replace_section(text, NEWS_SECTION, "Acquired a rival in May.")
+    assert section_text(updated, NEWS_SECTION) == "Acquired a rival in May."
+    for section in REQUIRED_SECTIONS:
+        if section != NEWS_SECTION:
+            assert section_text(updated, section) == section_text(text, section)
+    assert check_report(updated)["links"] == 6
+    assert replace_section("no headings here", NEWS_SECTION, "x") is None